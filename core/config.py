@@ -19,8 +19,12 @@ DIRS = {
     'static': os.path.join(BASE_DIR, 'static'),
 }
 
+# Default Firebase service account key, in the project root
+CRED_FILE = os.path.join(BASE_DIR, 'workplace-scheduler-ace38-firebase-adminsdk-fbsvc-4d7d358b05.json')
+
 # Days of the week
 DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
 
 # Firebase variables
 db = None
@@ -42,8 +46,8 @@ def firebase_available():
     
     return False
 
-def initialize_firebase():
-    """Initialize Firebase connection"""
+def initialize_firebase(cred_file=None):
+    """Initialize Firebase connection (cred_file defaults to CRED_FILE)"""
     global db, firebase_admin_app
     
     try:
@@ -58,8 +62,8 @@ def initialize_firebase():
             logger.info("Using existing Firebase app")
             return True
         
-        # Look for credentials file in the project root directory
-        cred_file = os.path.join(BASE_DIR, 'workplace-scheduler-ace38-firebase-adminsdk-fbsvc-4d7d358b05.json')
+        # Look for credentials file in the project root directory unless told otherwise
+        cred_file = cred_file or CRED_FILE
         
         if not os.path.exists(cred_file):
             logger.warning(f"Firebase credentials file not found: {cred_file}")
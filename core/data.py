@@ -5,12 +5,17 @@ import json
 import logging
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 
 from .config import DIRS, firebase_available, DAYS
 from .parser import time_to_hour
 from .firebase_manager import FirebaseManager
 
+try:
+    import orjson  # optional, faster serialization of data.json
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Global variables
@@ -30,12 +35,24 @@ def load_data() -> Dict[str, Any]:
         logger.error(f"Error loading data: {e}")
         return {}
 
+def _dump_data(data: Dict[str, Any]) -> bytes:
+    """Serialize data for data.json, with orjson when it can handle the contents"""
+    if orjson:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=4).encode('utf-8')
+
 def save_data(data: Dict[str, Any]) -> bool:
-    """Save data to JSON file"""
+    """Save data to JSON file (atomically, so a failed write never truncates it)"""
     try:
         os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+        raw = _dump_data(data)
+        tmp = f"{DATA_FILE}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp, DATA_FILE)
         return True
     except Exception as e:
         logger.error(f"Error saving data: {e}")
@@ -656,12 +673,14 @@ def delete_worker(workplace_id: str, worker_id_or_email: str) -> bool:
     dm.load_workplace(workplace_id)
     return dm.delete_worker(worker_id_or_email)
 
-def export_all_workers_to_firebase(workplace_id: str) -> bool:
+def export_all_workers_to_firebase(workplace_id: str,
+                                   progress_cb: Optional[Callable[[int], None]] = None) -> bool:
     """
     Export all workers from Excel to Firebase
     
     Args:
         workplace_id: Workplace ID
+        progress_cb: Called with the percentage of workers written so far
         
     Returns:
         True if successful, False otherwise
@@ -685,12 +704,8 @@ def export_all_workers_to_firebase(workplace_id: str) -> bool:
             logger.warning(f"No workers found in Excel for {workplace_id}")
             return False
         
-        # Add each worker to Firebase
-        success_count = 0
-        for worker in workers:
-            worker_id = firebase.add_worker(workplace_id, worker)
-            if worker_id:
-                success_count += 1
+        # Add the workers in batched writes
+        success_count = firebase.add_workers(workplace_id, workers, progress_cb)
         
         logger.info(f"Exported {success_count} of {len(workers)} workers to Firebase for {workplace_id}")
         return success_count > 0
@@ -699,13 +714,15 @@ def export_all_workers_to_firebase(workplace_id: str) -> bool:
         logger.error(f"Error exporting workers to Firebase: {e}")
         return False
 
-def save_workers_from_ui(workplace_id: str, workers: List[Dict[str, Any]]) -> bool:
+def save_workers_from_ui(workplace_id: str, workers: List[Dict[str, Any]],
+                         progress_cb: Optional[Callable[[int], None]] = None) -> bool:
     """
     Save workers from UI to Firebase
     
     Args:
         workplace_id: Workplace ID
         workers: List of worker data
+        progress_cb: Called with the percentage of workers written so far
         
     Returns:
         True if successful, False otherwise
@@ -724,12 +741,8 @@ def save_workers_from_ui(workplace_id: str, workers: List[Dict[str, Any]]) -> bo
         # Remove all existing workers
         firebase.remove_all_workers(workplace_id)
         
-        # Add each worker to Firebase
-        success_count = 0
-        for worker in workers:
-            worker_id = firebase.add_worker(workplace_id, worker)
-            if worker_id:
-                success_count += 1
+        # Add the workers in batched writes
+        success_count = firebase.add_workers(workplace_id, workers, progress_cb)
         
         logger.info(f"Saved {success_count} of {len(workers)} workers to Firebase for {workplace_id}")
         return success_count > 0
@@ -5,7 +5,7 @@ import time
 from datetime import datetime
 import firebase_admin
 from firebase_admin import credentials, firestore
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, List, Optional, Any, Union
 from .firebase_utils import FirebaseUtils
 
 logger = logging.getLogger(__name__)
@@ -115,6 +115,84 @@ class FirebaseManager:
             logger.error(f"Error getting workers for {workplace_id}: {e}")
             return []
     
+    def get_worker_by_email(self, workplace_id: Optional[str], email: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single worker by email without reading the whole collection
+        
+        Args:
+            workplace_id: Workplace ID (optional, uses current if not specified)
+            email: Worker email
+            
+        Returns:
+            Worker data if found, None otherwise
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return None
+        
+        # Use provided workplace_id or current
+        if not workplace_id:
+            if not self.current_workplace_id:
+                logger.error("No workplace ID provided")
+                return None
+            workplace_id = self.current_workplace_id
+        
+        # Normalize workplace ID
+        workplace_id = FirebaseUtils.normalize_workplace_id(workplace_id)
+        
+        try:
+            # Get workers collection reference (handles nested or flat)
+            workers_ref = FirebaseUtils.get_worker_collection_ref(self.db, workplace_id)
+            
+            # Query for the worker by email
+            docs = workers_ref.where("Email", "==", email).limit(1).get()
+            if not docs:
+                return None
+            
+            worker_data = docs[0].to_dict()
+            worker_data["id"] = docs[0].id
+            return FirebaseUtils.map_worker_from_firebase(worker_data)
+            
+        except Exception as e:
+            logger.error(f"Error getting worker with email {email} from {workplace_id}: {e}")
+            return None
+    
+    def count_workers(self, workplace_id: Optional[str] = None) -> int:
+        """
+        Count the workers in a workplace with an aggregation query
+        
+        Args:
+            workplace_id: Workplace ID (optional, uses current if not specified)
+            
+        Returns:
+            Number of workers (0 on error)
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return 0
+        
+        # Use provided workplace_id or current
+        if not workplace_id:
+            if not self.current_workplace_id:
+                logger.error("No workplace ID provided")
+                return 0
+            workplace_id = self.current_workplace_id
+        
+        # Normalize workplace ID
+        workplace_id = FirebaseUtils.normalize_workplace_id(workplace_id)
+        
+        try:
+            # Get workers collection reference (handles nested or flat)
+            workers_ref = FirebaseUtils.get_worker_collection_ref(self.db, workplace_id)
+            
+            # The server returns just the count instead of every document
+            result = workers_ref.count().get()
+            return int(result[0][0].value)
+            
+        except Exception as e:
+            logger.error(f"Error counting workers for {workplace_id}: {e}")
+            return 0
+    
     def add_worker(self, workplace_id: Optional[str], worker_data: Dict[str, Any]) -> Optional[str]:
         """
         Add a worker to a workplace
@@ -158,6 +236,61 @@ class FirebaseManager:
             logger.error(f"Error adding worker to {workplace_id}: {e}")
             return None
     
+    def add_workers(self, workplace_id: Optional[str], workers: List[Dict[str, Any]],
+                    progress_cb: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Add many workers to a workplace using batched writes
+        
+        Args:
+            workplace_id: Workplace ID (optional, uses current if not specified)
+            workers: List of worker data
+            progress_cb: Called with the percentage of workers written after each batch
+            
+        Returns:
+            Number of workers added
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return 0
+        
+        # Use provided workplace_id or current
+        if not workplace_id:
+            if not self.current_workplace_id:
+                logger.error("No workplace ID provided")
+                return 0
+            workplace_id = self.current_workplace_id
+        
+        # Normalize workplace ID
+        workplace_id = FirebaseUtils.normalize_workplace_id(workplace_id)
+        
+        added = 0
+        try:
+            # Get workers collection reference (handles nested or flat)
+            workers_ref = FirebaseUtils.get_worker_collection_ref(self.db, workplace_id)
+            
+            # Write in batches (max 500 per batch), one commit per batch
+            batch_size = 450  # Keep under 500 to be safe
+            for i in range(0, len(workers), batch_size):
+                batch = self.db.batch()
+                chunk = workers[i:i+batch_size]
+                
+                for worker_data in chunk:
+                    # document() with no ID gets an auto-generated one, like add()
+                    batch.set(workers_ref.document(), FirebaseUtils.map_worker_to_firebase(worker_data))
+                
+                batch.commit()
+                added += len(chunk)
+                
+                if progress_cb:
+                    progress_cb(added * 100 // len(workers))
+            
+            logger.info(f"Added {added} workers to {workplace_id}")
+            return added
+            
+        except Exception as e:
+            logger.error(f"Error adding workers to {workplace_id} after {added} were written: {e}")
+            return added
+    
     def update_worker(self, workplace_id: Optional[str], worker_id: str, worker_data: Dict[str, Any]) -> bool:
         """
         Update a worker
@@ -413,7 +546,7 @@ class FirebaseManager:
         
         Args:
             workplace_id: Workplace ID (optional, uses current if not specified)
-            hours_data: Hours of operation data
+            hours_data: Hours of operation data (replaces the stored map as a whole)
             
         Returns:
             True if successful, False otherwise
@@ -433,14 +566,18 @@ class FirebaseManager:
         workplace_id = FirebaseUtils.normalize_workplace_id(workplace_id)
         
         try:
-            # Update in both places to ensure compatibility
+            # Update in both places to ensure compatibility, in one batch commit
+            batch = self.db.batch()
             
-            # 1. Update in the nested structure (recommended)
+            # 1. Update in the nested structure (recommended); merging on the field path
+            # replaces the whole map, so days left out of hours_data don't linger
             workplace_ref = self.db.collection('workplaces').document(workplace_id)
-            workplace_ref.set({'hours_of_operation': hours_data}, merge=True)
+            batch.set(workplace_ref, {'hours_of_operation': hours_data}, merge=['hours_of_operation'])
             
             # 2. Update in the flat structure (for backwards compatibility)
-            self.db.collection(workplace_id).document('hours_of_operation').set(hours_data)
+            batch.set(self.db.collection(workplace_id).document('hours_of_operation'), hours_data)
+            
+            batch.commit()
             
             logger.info(f"Updated hours of operation for {workplace_id}")
             return True
@@ -488,13 +625,19 @@ class FirebaseManager:
             if 'name' not in schedule_data:
                 schedule_data['name'] = f"{workplace_id.replace('_', ' ').title()} Schedule {datetime.now().strftime('%Y-%m-%d')}"
             
+            # Both writes go out in one batch commit
+            batch = self.db.batch()
+            
             # Save to nested structure (recommended)
             schedules_ref = self.db.collection('workplaces').document(workplace_id).collection('schedules')
-            schedule_ref = schedules_ref.add(schedule_data)
-            schedule_id = schedule_ref[1].id
+            schedule_ref = schedules_ref.document()
+            batch.set(schedule_ref, schedule_data)
+            schedule_id = schedule_ref.id
             
             # Also save as current schedule in the flat structure (for backwards compatibility)
-            self.db.collection(workplace_id).document('current_schedule').set(schedule_data)
+            batch.set(self.db.collection(workplace_id).document('current_schedule'), schedule_data)
+            
+            batch.commit()
             
             logger.info(f"Saved schedule with ID {schedule_id} for {workplace_id}")
             return schedule_id
@@ -503,6 +646,45 @@ class FirebaseManager:
             logger.error(f"Error saving schedule for {workplace_id}: {e}")
             return None
     
+    def get_schedule(self, workplace_id: Optional[str], schedule_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single saved schedule by ID
+        
+        Args:
+            workplace_id: Workplace ID (optional, uses current if not specified)
+            schedule_id: Schedule ID
+            
+        Returns:
+            Schedule data if found, None otherwise
+        """
+        if not self.db:
+            logger.error("Firebase not initialized")
+            return None
+        
+        # Use provided workplace_id or current
+        if not workplace_id:
+            if not self.current_workplace_id:
+                logger.error("No workplace ID provided")
+                return None
+            workplace_id = self.current_workplace_id
+        
+        # Normalize workplace ID
+        workplace_id = FirebaseUtils.normalize_workplace_id(workplace_id)
+        
+        try:
+            doc = (self.db.collection('workplaces').document(workplace_id)
+                   .collection('schedules').document(schedule_id).get())
+            if not doc.exists:
+                return None
+            
+            schedule = doc.to_dict()
+            schedule['id'] = doc.id
+            return schedule
+            
+        except Exception as e:
+            logger.error(f"Error getting schedule {schedule_id} for {workplace_id}: {e}")
+            return None
+    
     def get_schedules(self, workplace_id: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get schedules for a workplace
@@ -1,25 +1,34 @@
 # schedule_app/core/parser.py
 
 import re
+from functools import lru_cache
 import pandas as pd
 
 DAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
 
+@lru_cache(maxsize=None)
+def _str_to_hour(t):
+    parts = t.split(":")
+    if len(parts) == 2:
+        try:
+            return int(parts[0]) + int(parts[1]) / 60
+        except ValueError:
+            pass
+    return None
+
 def time_to_hour(t):
     """Convert time string to decimal hour (e.g. '14:30' -> 14.5)"""
     if isinstance(t, str):
-        parts = t.split(":")
-        if len(parts) == 2:
-            try:
-                return int(parts[0]) + int(parts[1]) / 60
-            except ValueError:
-                pass
+        hour = _str_to_hour(t)
+        if hour is not None:
+            return hour
     # fallback for bad formats
     try:
         return float(t)
     except:
         return 0.0
 
+@lru_cache(maxsize=512)
 def format_time_ampm(time_str):
     """Format 'HH:MM' to 'h:MM AM/PM'"""
     try:
@@ -1,15 +1,29 @@
 # schedule_app/core/scheduler.py
 
+import sys
+import json
 import random
+import hashlib
+import heapq
+import itertools
 import logging
-from datetime import datetime
+from bisect import bisect_left, bisect_right
 from .parser import time_to_hour, format_time_ampm, parse_availability
 from .data import get_workers, get_hours_of_operation
-from core.config import DAYS
+from core.config import DAY_INDEX
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Preferred shift lengths (hours), and every order they can be tried in
+SHIFT_LENGTHS = (2, 3, 4, 5)
+_LENGTH_ORDERS = tuple(itertools.permutations(SHIFT_LENGTHS))
+
+# Matching cost for a worker who cannot take a shift (dominates any worker's score)
+UNAVAILABLE_COST = 1e6
+# Phase 2 score multiplier for work study students (their hours come from phase 1)
+WORK_STUDY_WEIGHT = 0.5
+
 def hour_to_time_str(hour: float) -> str:
     """Convert decimal hour to HH:MM (24h), allowing values up to 24:00."""
     h = int(hour)
@@ -19,6 +33,48 @@ def hour_to_time_str(hour: float) -> str:
 def overlaps(s1: float, e1: float, s2: float, e2: float) -> bool:
     return max(s1, s2) < min(e1, e2)
 
+class FreeIntervals:
+    """Sorted, non-overlapping free (start_hour, end_hour) segments for one day."""
+
+    def __init__(self, windows=()):
+        self._starts = []
+        self._ends = []
+        for start, end in sorted(windows):
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def _first_overlapping(self, start):
+        i = bisect_right(self._starts, start) - 1
+        if i < 0:
+            return 0
+        return i if self._ends[i] > start else i + 1
+
+    def subtract(self, start: float, end: float):
+        """Mark start→end as occupied, splitting the covering segment(s)."""
+        i = self._first_overlapping(start)
+        j = bisect_left(self._starts, end)
+        if i >= j:
+            return
+        new_starts, new_ends = [], []
+        if self._starts[i] < start:
+            new_starts.append(self._starts[i])
+            new_ends.append(start)
+        if self._ends[j - 1] > end:
+            new_starts.append(end)
+            new_ends.append(self._ends[j - 1])
+        self._starts[i:j] = new_starts
+        self._ends[i:j] = new_ends
+
+    def irange(self, start: float, end: float):
+        """Yield the free segments clipped to the window start→end."""
+        i = self._first_overlapping(start)
+        while i < len(self._starts) and self._starts[i] < end:
+            yield max(self._starts[i], start), min(self._ends[i], end)
+            i += 1
+
 def is_worker_available(worker: dict, day: str,
                         shift_start: float, shift_end: float) -> bool:
     """True if `worker` is free on `day` from shift_start→shift_end."""
@@ -27,25 +83,147 @@ def is_worker_available(worker: dict, day: str,
             return True
     return False
 
+def build_availability_index(workers: list) -> dict:
+    """
+    Group every availability block by day, sorted by start hour.
+
+    Each day maps to parallel (starts, ends, worker_index) NumPy arrays so
+    available_worker_indexes is a couple of vectorized comparisons.
+    """
+    import numpy as np  # deferred: only the availability dialogs need it
+    by_day = {}
+    for i, w in enumerate(workers):
+        for day, blocks in w.get('availability', {}).items():
+            for b in blocks:
+                by_day.setdefault(day, []).append((b.get('start_hour', 0), b.get('end_hour', 24), i))
+
+    index = {}
+    for day, entries in by_day.items():
+        entries.sort()
+        starts, ends, idx = zip(*entries)
+        index[day] = (
+            np.array(starts, dtype=np.float64),
+            np.array(ends, dtype=np.float64),
+            np.array(idx, dtype=np.int32),
+        )
+    return index
+
+def available_worker_indexes(index: dict, day: str,
+                             shift_start: float, shift_end: float) -> list:
+    """Sorted positions of the workers is_worker_available accepts, via build_availability_index."""
+    if day not in index:
+        return []
+    import numpy as np
+    # Only blocks starting by shift_start can cover the shift
+    starts, ends, idx = index[day]
+    n = starts.searchsorted(shift_start, side='right')
+    return np.unique(idx[:n][ends[:n] >= shift_end]).tolist()
+
+def hours_mask(start: float, end: float) -> int:
+    """Bitmask with one bit per minute from start→end (hours since midnight)."""
+    s = int(round(start * 60))
+    e = int(round(end * 60))
+    return (1 << e) - (1 << s) if e > s else 0
+
+def build_availability_masks(worker: dict) -> dict:
+    """Return {day: minute bitmask} covering all of `worker`'s availability."""
+    masks = {}
+    for day, slots in worker.get('availability', {}).items():
+        m = 0
+        for a in slots:
+            m |= hours_mask(a['start_hour'], a['end_hour'])
+        masks[day] = m
+    return masks
+
 def find_alternative_workers(workers: list,
                              day: str,
                              start: float,
                              end: float,
                              assigned_hours: dict,
                              max_hours: float,
-                             already_assigned: list):
-    """Return a sorted list of workers who could cover day start→end."""
+                             already_assigned: list,
+                             worker_masks: dict = None):
+    """
+    Return a sorted list of workers who could cover day start→end.
+
+    If `worker_masks` ({email: {day: mask}}, see build_availability_masks)
+    is given, availability is checked against it instead of re-walking
+    each worker's availability list.
+    """
+    shift_mask = hours_mask(start, end)
+    duration = end - start
+    skip = set(already_assigned)
     alts = []
     for w in workers:
         em = w['email']
-        if em in already_assigned:
+        if em in skip:
             continue
-        if is_worker_available(w, day, start, end) and \
-           assigned_hours.get(em, 0) + (end - start) <= max_hours:
+        if worker_masks is not None:
+            available = worker_masks[em].get(day, 0) & shift_mask == shift_mask
+        else:
+            available = is_worker_available(w, day, start, end)
+        if available and assigned_hours.get(em, 0) + duration <= max_hours:
             alts.append(w)
     alts.sort(key=lambda w: assigned_hours.get(w['email'], 0))
     return alts
 
+def _min_cost_assignment(cost):
+    """
+    Solve the rectangular assignment problem with the Hungarian algorithm.
+
+    Args:
+        cost: n×m matrix (list of lists) with n <= m
+
+    Returns:
+        List giving the column assigned to each row
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    result = [-1] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            result[p[j] - 1] = j - 1
+    return result
+
 def find_optimal_shift_split(windows, remaining_hours, prefer_split=True):
     """
     Find an optimal split of shifts for a work study student
@@ -163,14 +341,72 @@ def recently_scheduled(worker_email, day, shift_start, schedule, buffer_hours=0.
         
     for shift in schedule.get(day, []):
         if worker_email in shift.get('raw_assigned', []):
-            shift_end = time_to_hour(shift['end'])
+            shift_end = shift['end_hour'] if 'end_hour' in shift else time_to_hour(shift['end'])
             # If this worker's last shift ended within buffer_hours of this one
             if abs(shift_end - shift_start) < buffer_hours:
                 return True
     return False
 
+def adjacent_emails(shifts, start, end, buffer_hours=0.5):
+    """Emails of everyone on a shift that ends within buffer_hours of start or starts within buffer_hours of end"""
+    busy = set()
+    for shift in shifts:
+        shift_start = shift['start_hour'] if 'start_hour' in shift else time_to_hour(shift['start'])
+        shift_end = shift['end_hour'] if 'end_hour' in shift else time_to_hour(shift['end'])
+        if abs(shift_end - start) < buffer_hours or abs(shift_start - end) < buffer_hours:
+            busy.update(shift.get('raw_assigned', []))
+    return busy
+
+def split_free_slot(start, end, rng=None, block=4.0, min_length=2.0):
+    """
+    Cut a free slot into consecutive (start, end) shifts.
+
+    By default the slot is divided into `block`-hour shifts in one pass; a
+    remainder shorter than `min_length` is folded into the last shift. If
+    `rng` is given, lengths are instead drawn from SHIFT_LENGTHS for variety.
+    """
+    if rng is None:
+        n_blocks, rem = divmod(end - start, block)
+        n_blocks = int(n_blocks)
+        cuts = [(start + i * block, start + (i + 1) * block) for i in range(n_blocks)]
+        if rem >= min_length or not cuts:
+            cuts.append((start + n_blocks * block, end))
+        elif rem > 0:
+            cuts[-1] = (cuts[-1][0], end)
+        return cuts
+
+    cuts = []
+    cur = start
+    while cur < end:
+        # Prefer common shift lengths but have some variety, avoiding
+        # lengths that would leave a sliver too short to staff
+        order = _LENGTH_ORDERS[rng.randrange(len(_LENGTH_ORDERS))]
+        rest = end - cur
+        length = next(
+            (l for l in order if l == rest or l <= rest - min_length),
+            next((l for l in order if l <= rest), rest)
+        )
+        cut_end = min(cur + length, end)
+        cuts.append((cur, cut_end))
+        cur = cut_end
+    return cuts
+
+def _hash_inputs(hours_of_operation, workers, *params):
+    """Stable seed derived from the scheduling inputs (same inputs → same schedule)"""
+    canonical = json.dumps([
+        hours_of_operation,
+        [
+            [w.get('email'), w.get('first_name'), w.get('last_name'),
+             w.get('work_study', False), w.get('availability', {})]
+            for w in workers
+        ],
+        params
+    ], sort_keys=True, default=str)
+    return int.from_bytes(hashlib.sha256(canonical.encode()).digest()[:8], 'big')
+
 def create_shifts_from_availability(hours_of_operation=None, workers=None, workplace_id=None, 
-                                    max_hours_per_worker=20.0, max_workers_per_shift=2, min_hours_per_worker=3):
+                                    max_hours_per_worker=20.0, max_workers_per_shift=2, min_hours_per_worker=3,
+                                    seed=None, vary_shift_lengths=False):
     """
     Create shifts from worker availability and hours of operation.
     
@@ -185,6 +421,10 @@ def create_shifts_from_availability(hours_of_operation=None, workers=None, workp
         max_hours_per_worker: Maximum hours per worker (default: 20.0)
         max_workers_per_shift: Maximum workers per shift (default: 2)
         min_hours_per_worker: Minimum hours for non-work-study workers (default: 3)
+        seed: Seed for tie-breaking; defaults to a hash of the inputs so the
+              same inputs always produce the same schedule
+        vary_shift_lengths: Mix 2-5 hour shifts instead of splitting free time
+              into 4 hour blocks (default: False)
     
     Returns:
       schedule: dict[day, list of shift dicts],
@@ -211,12 +451,19 @@ def create_shifts_from_availability(hours_of_operation=None, workers=None, workp
         logger.warning(f"No workers provided")
         return {}, {}, [], [], {}, [], [], []
     
-    random.seed(datetime.now().timestamp())
-
-    schedule = {}
+    if seed is None:
+        seed = _hash_inputs(hours_of_operation, workers, max_hours_per_worker,
+                            max_workers_per_shift, min_hours_per_worker)
+    rng = random.Random(seed)
+
+    # Format each worker's display name once instead of per shift
+    names = {w['email']: sys.intern(f"{w['first_name']} {w['last_name']}") for w in workers}
+
+    # One list per operating day, in week order, so shifts append without setdefault
+    operating_days = [day for day, ops in hours_of_operation.items() if ops]
+    operating_days.sort(key=lambda day: DAY_INDEX[day])
+    schedule = {day: [] for day in operating_days}
     unfilled_shifts = []
-    shift_lengths = [2, 3, 4, 5]
-    random.shuffle(shift_lengths)
 
     # track how many hours each email has
     assigned_hours = {w['email']: 0 for w in workers}
@@ -233,11 +480,37 @@ def create_shifts_from_availability(hours_of_operation=None, workers=None, workp
     ws_availability_issues = check_work_study_availability(ws_workers, hours_of_operation)
     if ws_availability_issues:
         for worker, issue in ws_availability_issues:
-            logger.warning(f"Work study {worker['first_name']} {worker['last_name']}: {issue}")
+            logger.warning(f"Work study {names[worker['email']]}: {issue}")
     
+    # Availability as minute bitmasks so a shift check is a single AND
+    worker_masks = {w['email']: build_availability_masks(w) for w in workers}
+
+    # Free (not yet scheduled) time per day, seeded from the hours of operation
+    free_intervals = {}
+    day_workers = {}
+    for day, ops in hours_of_operation.items():
+        windows = []
+        op_mask = 0
+        for op in ops:
+            op_start = time_to_hour(op['start'])
+            op_end = time_to_hour(op['end'])
+            if op_end <= op_start:
+                op_end += 24
+            windows.append((op_start, op_end))
+            op_mask |= hours_mask(op_start, op_end)
+        free_intervals[day] = FreeIntervals(windows)
+        # only workers available at some point during the day's operating hours,
+        # kept as parallel (worker, email, mask, work_study) columns for the phase 2 scan
+        roster = [
+            (w, w['email'], worker_masks[w['email']].get(day, 0), ws_status[w['email']])
+            for w in workers
+            if worker_masks[w['email']].get(day, 0) & op_mask
+        ]
+        day_workers[day] = tuple(map(list, zip(*roster))) if roster else ([], [], [], [])
+
     # Initial work study issues
     initial_ws_issues = [
-        f"{w['first_name']} {w['last_name']}: {issue}"
+        f"{names[w['email']]}: {issue}"
         for w, issue in ws_availability_issues
     ]
 
@@ -273,30 +546,33 @@ def create_shifts_from_availability(hours_of_operation=None, workers=None, workp
             # Enforce max_workers_per_shift
             slot_start = hour_to_time_str(start)
             slot_end = hour_to_time_str(end)
-            existing_shifts = [
-                s for s in schedule.get(day, [])
+            existing_workers = sum(
+                len(s['raw_assigned']) for s in schedule[day]
                 if s['start'] == slot_start and s['end'] == slot_end
-            ]
-            if len(existing_shifts) < max_workers_per_shift:
-                schedule.setdefault(day, []).append({
+            )
+            if existing_workers < max_workers_per_shift:
+                schedule[day].append({
                     "start": slot_start,
                     "end": slot_end,
-                    "assigned": [f"{w['first_name']} {w['last_name']}"],
-                    "available": [f"{w['first_name']} {w['last_name']}"],
+                    "start_hour": start,
+                    "end_hour": end,
+                    "assigned": [names[w['email']]],
+                    "available": [names[w['email']]],
                     "raw_assigned": [em],
                     "all_available": [w],
                     "is_work_study": True
                 })
+                free_intervals[day].subtract(start, end)
                 assigned_hours[em] += duration
                 remaining -= duration
             else:
-                logger.warning(f"Skipping work study shift for {w['first_name']} {w['last_name']} on {day} {slot_start}-{slot_end} due to max_workers_per_shift limit.")
+                logger.warning(f"Skipping work study shift for {names[w['email']]} on {day} {slot_start}-{slot_end} due to max_workers_per_shift limit.")
                 # Optionally, add to ws_issues or similar
 
         if remaining > 0:
             # mark issue--will show up in your ws_issues list
             logger.warning(
-                f"Work-study {w['first_name']} {w['last_name']} "
+                f"Work-study {names[w['email']]} "
                 f"only got {5-remaining:.1f}h out of 5h"
             )
 
@@ -305,17 +581,10 @@ def create_shifts_from_availability(hours_of_operation=None, workers=None, workp
     #    Sort workers by ratio of (assigned_hours / availability_hours)
     #    to ensure even distribution relative to availability
     #
-    days = list(hours_of_operation.keys())
-    
     # Keep days in order to make schedule more predictable
     # This helps with consistency across schedule generations
-    days.sort(key=DAYS.index)
-    
-    for day in days:
-        ops = hours_of_operation.get(day, [])
-        if not ops:
-            continue
-        schedule.setdefault(day, [])
+    for day, day_shifts in schedule.items():
+        ops = hours_of_operation[day]
 
         for op in ops:
             op_start = time_to_hour(op['start'])
@@ -323,21 +592,8 @@ def create_shifts_from_availability(hours_of_operation=None, workers=None, workp
             if op_end <= op_start:
                 op_end += 24
 
-            # subtract out already-scheduled blocks to get free slots
-            free_slots = [(op_start, op_end)]
-            for blk in schedule.get(day, []):
-                s1 = time_to_hour(blk['start'])
-                e1 = time_to_hour(blk['end'])
-                new_free = []
-                for (s0, e0) in free_slots:
-                    if e0 <= s1 or s0 >= e1:
-                        new_free.append((s0, e0))
-                    else:
-                        if s0 < s1:
-                            new_free.append((s0, s1))
-                        if e0 > e1:
-                            new_free.append((e1, e0))
-                free_slots = new_free
+            # free slots = operating window minus already-scheduled blocks
+            free_slots = list(free_intervals[day].irange(op_start, op_end))
 
             # Sort free slots by duration (shortest first)
             # This helps create more balanced shift lengths
@@ -347,126 +603,167 @@ def create_shifts_from_availability(hours_of_operation=None, workers=None, workp
             for (s0, e0) in free_slots:
                 if (e0 - s0) < 2:
                     continue
+                free_intervals[day].subtract(s0, e0)
                 
-                # Prefer common shift lengths but have some variety
-                lengths = [l for l in shift_lengths if l <= (e0 - s0)] or [2]
-                
-                cur = s0
-                while cur < e0:
-                    random.shuffle(lengths)
-                    length = next((l for l in lengths if cur + l <= e0), lengths[0])
-                    end_shift = min(cur + length, e0)
+                # carve the slot into consecutive shifts
+                cuts = split_free_slot(s0, e0, rng if vary_shift_lengths else None)
+
+                # Matching cost: availability x slack x work-study score, negated
+                # (so the matcher prefers workers with more unused availability
+                # and more hours left under max_hours_per_worker)
+                def shift_cost(worker, shift_duration):
+                    w_email = worker['email']
+                    avail_hours = max(availability_hours.get(w_email, 1), 1)  # Avoid div by zero
+                    availability = 1 / (1 + assigned_hours[w_email] / avail_hours)
+                    slack = (max_hours_per_worker - assigned_hours[w_email] - shift_duration) / (max_hours_per_worker or 1)
+                    work_study = WORK_STUDY_WEIGHT if ws_status[w_email] else 1.0
+                    return -(availability * slack * work_study) + ties[w_email]
+
+                def can_take(w_email, w_ws, shift_duration):
+                    # Work study students only top up hours started in phase 1
+                    if w_ws and not 0 < assigned_hours[w_email] < 5:
+                        return False
+                    return assigned_hours[w_email] + shift_duration <= max_hours_per_worker
+
+                # pick available workers for every shift in the slot
+                avail_by_cut = []
+                candidates = {}
+                ties = {}
+                for cur, end_shift in cuts:
                     shift_duration = end_shift - cur
-
-                    # pick available workers
+                    shift_mask = hours_mask(cur, end_shift)
+                    # Skip workers who just had a shift or start one right after (avoid back-to-back shifts)
+                    busy = adjacent_emails(day_shifts, cur, end_shift)
                     avail = []
-                    for x in workers:
-                        x_em = x['email']
-                        
-                        # Skip work study students who have their hours or haven't been scheduled yet
-                        if ws_status.get(x_em, False):
-                            if assigned_hours[x_em] >= 5:
-                                continue
-                            # ensure WS only gets their 5h in phase 1
-                            if assigned_hours[x_em] == 0:
-                                continue
-                            
-                        # Skip workers who just had a shift (avoid back-to-back shifts)
-                        if recently_scheduled(x_em, day, cur, schedule):
+                    for x, x_em, x_mask, x_ws in zip(*day_workers[day]):
+                        if x_em in busy or not can_take(x_em, x_ws, shift_duration):
                             continue
-                            
-                        # Regular worker availability check
-                        if is_worker_available(x, day, cur, end_shift) and \
-                           assigned_hours[x_em] + shift_duration <= max_hours_per_worker:
+                        if x_mask & shift_mask == shift_mask:
                             avail.append(x)
-
-                    # Calculate fairness ratio: assigned_hours / availability_hours
-                    # This ensures workers with less availability get fair consideration
-                    def fairness_score(worker):
-                        w_email = worker['email']
-                        avail_hours = max(availability_hours.get(w_email, 1), 1)  # Avoid div by zero
-                        assigned = assigned_hours.get(w_email, 0)
-                        ratio = assigned / avail_hours
-                        # Add small random factor to break ties
-                        return (ratio, random.random())
-                    
-                    # Sort by fairness ratio (lowest first)
-                    avail.sort(key=fairness_score)
-                    chosen = avail[:max_workers_per_shift]
-
-                    # assign those chosen
+                            if x_em not in candidates:
+                                candidates[x_em] = x
+                                # Add small random factor to break ties
+                                ties[x_em] = rng.random() * 1e-6
+
+                    # Sort by cost (best first)
+                    avail.sort(key=lambda y: shift_cost(y, shift_duration))
+                    avail_by_cut.append(avail)
+
+                # Match (shift, seat) rows against candidate workers so the
+                # whole slot is staffed at once, one shift per worker
+                cand = list(candidates.values())
+                cand_index = {x['email']: j for j, x in enumerate(cand)}
+                n_rows = len(cuts) * max_workers_per_shift
+                n_cols = max(len(cand), n_rows)
+                cost = []
+                for (cur, end_shift), avail in zip(cuts, avail_by_cut):
+                    row = [UNAVAILABLE_COST] * n_cols
+                    for y in avail:
+                        row[cand_index[y['email']]] = shift_cost(y, end_shift - cur)
+                    cost.extend([row] * max_workers_per_shift)
+                match = _min_cost_assignment(cost) if cand else [-1] * n_rows
+
+                chosen_by_cut = []
+                for c, (cur, end_shift) in enumerate(cuts):
+                    seats = match[c * max_workers_per_shift:(c + 1) * max_workers_per_shift]
+                    chosen = [
+                        cand[j] for j in seats
+                        if 0 <= j < len(cand) and cost[c * max_workers_per_shift][j] < UNAVAILABLE_COST
+                    ]
                     for x in chosen:
+                        assigned_hours[x['email']] += end_shift - cur
+                    chosen_by_cut.append(chosen)
+
+                # The match gives a worker at most one shift of the slot; fill the
+                # seats it left open with workers who can take another shift that
+                # is not next to one they already have
+                for c, (cur, end_shift) in enumerate(cuts):
+                    missing = max_workers_per_shift - len(chosen_by_cut[c])
+                    if not missing:
+                        continue
+                    shift_duration = end_shift - cur
+                    taken = {x['email'] for n in (c - 1, c, c + 1) if 0 <= n < len(cuts)
+                             for x in chosen_by_cut[n]}
+                    extra = heapq.nsmallest(missing, (
+                        y for y in avail_by_cut[c]
+                        if y['email'] not in taken and can_take(y['email'], ws_status[y['email']], shift_duration)
+                    ), key=lambda y: shift_cost(y, shift_duration))
+                    for x in extra:
                         assigned_hours[x['email']] += shift_duration
+                    chosen_by_cut[c].extend(extra)
 
-                    # record individual shifts--one entry per worker
-                    for x in chosen:
-                        schedule.setdefault(day, []).append({
-                            "start": hour_to_time_str(cur),
-                            "end": hour_to_time_str(end_shift),
-                            "assigned": [f"{x['first_name']} {x['last_name']}"],
-                            "available": [f"{y['first_name']} {y['last_name']}" for y in avail],
-                            "raw_assigned": [x['email']],
-                            "all_available": avail
-                        })
+                for (cur, end_shift), avail, chosen in zip(cuts, avail_by_cut, chosen_by_cut):
+                    slot_start = hour_to_time_str(cur)
+                    slot_end = hour_to_time_str(end_shift)
 
                     # if we didn't fill up to max_workers, mark unfilled slots
-                    for _ in range(max_workers_per_shift - len(chosen)):
+                    missing = max_workers_per_shift - len(chosen)
+                    for _ in range(missing):
                         unfilled_shifts.append({
                             "day": day,
-                            "start": hour_to_time_str(cur),
-                            "end": hour_to_time_str(end_shift),
+                            "start": slot_start,
+                            "end": slot_end,
                             "start_hour": cur,
                             "end_hour": end_shift
                         })
-                        schedule.setdefault(day, []).append({
-                            "start": hour_to_time_str(cur),
-                            "end": hour_to_time_str(end_shift),
-                            "assigned": ["Unfilled"],
-                            "available": [f"{y['first_name']} {y['last_name']}" for y in avail],
-                            "raw_assigned": [],
-                            "all_available": avail
-                        })
 
-                    cur = end_shift
+                    # record one shift per time slot, shared by everyone assigned to it
+                    day_shifts.append({
+                        "start": slot_start,
+                        "end": slot_end,
+                        "start_hour": cur,
+                        "end_hour": end_shift,
+                        "assigned": [names[x['email']] for x in chosen] + ["Unfilled"] * missing,
+                        "available": [names[y['email']] for y in avail],
+                        "raw_assigned": [x['email'] for x in chosen],
+                        "all_available": avail
+                    })
 
     #
     # 3) Build summaries
     #
     low_hours = [
-        f"{w['first_name']} {w['last_name']}"
+        names[w['email']]
         for w in workers
         if not ws_status[w['email']] and assigned_hours[w['email']] < 4
     ]
     unassigned = [
-        f"{w['first_name']} {w['last_name']}"
+        names[w['email']]
         for w in workers
         if assigned_hours[w['email']] == 0
     ]
     
     # Include both initial issues and final check
+    ws_issue_names = {sys.intern(issue.split(':')[0]) for issue in initial_ws_issues}
     ws_issues = initial_ws_issues + [
-        f"{w['first_name']} {w['last_name']} ({assigned_hours[w['email']]}h)"
+        f"{names[w['email']]} ({assigned_hours[w['email']]}h)"
         for w in workers
         if ws_status[w['email']] and assigned_hours[w['email']] != 5 
-        and f"{w['first_name']} {w['last_name']}" not in [issue.split(':')[0] for issue in initial_ws_issues]
+        and names[w['email']] not in ws_issue_names
     ]
 
     # New: collect workers below min_hours_per_worker (non-work-study only)
     min_hours_issues = [
-        f"{w['first_name']} {w['last_name']}"
+        names[w['email']]
         for w in workers
         if not ws_status[w['email']] and assigned_hours[w['email']] < min_hours_per_worker
     ]
 
     # alternative solutions for any unfilled
+    # (assigned hours no longer change here, so identical slots share one lookup)
     alt_sols = {}
+    seen_slots = set()
     for us in unfilled_shifts:
         key = f"{us['day']} {us['start']}-{us['end']}"
+        slot = (us['day'], us['start_hour'], us['end_hour'])
+        if slot in seen_slots:
+            continue
+        seen_slots.add(slot)
         sols = find_alternative_workers(
             workers, us['day'], us['start_hour'], us['end_hour'],
-            assigned_hours, max_hours_per_worker * 1.5, []
+            assigned_hours, max_hours_per_worker * 1.5, [], worker_masks
         )
         if sols:
-            alt_sols[key] = [f"{w['first_name']} {w['last_name']}" for w in sols]
+            alt_sols[key] = [names[w['email']] for w in sols]
 
     return schedule, assigned_hours, low_hours, unassigned, alt_sols, unfilled_shifts, ws_issues, min_hours_issues
\ No newline at end of file
@@ -0,0 +1,68 @@
+# schedule_app/core/worker_cache.py
+
+import os
+import pickle
+import tempfile
+import logging
+from .config import DIRS
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(DIRS['data'], 'cache')
+# Bumped whenever the cached payload changes shape
+CACHE_VERSION = 2
+
+def _cache_path(path):
+    """Cache file for a workplace Excel file"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{name}.pkl")
+
+def load_cached(path):
+    """
+    Look up the workers parsed from an Excel file on a previous load
+
+    Returns:
+        (mtime, workers, index): the file's current st_mtime_ns, and the cached
+        workers and their availability index if they were parsed from this
+        version of the file, else None for both
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, None, None
+
+    try:
+        with open(_cache_path(path), 'rb') as f:
+            version, cached_path, cached_mtime, workers, index = pickle.load(f)
+    except Exception as e:
+        # Unpickling can fail in many ways (e.g. a cache written by another NumPy); rebuild it
+        logger.warning(f"Ignoring unreadable worker cache for {path}: {e}")
+        return mtime, None, None
+
+    if version != CACHE_VERSION or cached_path != os.path.abspath(path) or cached_mtime != mtime:
+        return mtime, None, None
+    return mtime, workers, index
+
+def save_cached(path, mtime, workers, index=None):
+    """Store the workers parsed from an Excel file (and their index), keyed by the mtime it had when read"""
+    if mtime is None:
+        return
+
+    target = _cache_path(path)
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # A temp file of its own, so concurrent writers never share one
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((CACHE_VERSION, os.path.abspath(path), mtime, workers, index), f, protocol=5)
+        # Readers only ever see a complete cache file
+        os.replace(tmp, target)
+    except (OSError, pickle.PickleError) as e:
+        logger.warning(f"Could not write worker cache for {path}: {e}")
+        if tmp:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
@@ -4,29 +4,47 @@
 import sys
 import os
 import logging
-from PyQt5.QtWidgets import QApplication, QMessageBox, QMainWindow, QPushButton, QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PyQt5.QtWidgets import QApplication, QMessageBox, QPushButton, QWidget, QVBoxLayout, QHBoxLayout, QLabel
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
-from ui.main_window import MainWindow
+from ui.main_window import MainWindow, saved_cred_path
 from core.data import get_data_manager
 from core.config import firebase_available, initialize_firebase
 
-# Configure logging
-os.makedirs('logs', exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
-if os.name == 'nt':
-    import ctypes
-    ctypes.windll.user32.ShowWindow(ctypes.windll.kernel32.GetConsoleWindow(), 0)
+EXIT_BUTTON_STYLE = """
+    QPushButton#exitBtn {
+        background-color: #dc3545;
+        color: white;
+        border-radius: 15px;
+        font-weight: bold;
+        font-size: 14px;
+    }
+    QPushButton#exitBtn:hover {
+        background-color: #bd2130;
+    }
+"""
+
+def _configure_logging():
+    """Set up file and console logging (done at startup, not on import)"""
+    os.makedirs('logs', exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('logs/app.log', delay=True),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+def _prompts_suppressed():
+    """True when running headless (offscreen Qt platform or SCHEDULE_APP_NOPROMPT set)"""
+    return (
+        os.environ.get('QT_QPA_PLATFORM') == 'offscreen'
+        or bool(os.environ.get('SCHEDULE_APP_NOPROMPT'))
+        or '--no-gui-prompts' in sys.argv
+    )
 
 class FullscreenMainWindow(MainWindow):
     """Extended MainWindow that opens in fullscreen with exit button"""
@@ -49,48 +67,29 @@ class FullscreenMainWindow(MainWindow):
         # Create exit button
         exit_btn = QPushButton("✕")
         exit_btn.setFixedSize(30, 30)
-        exit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                border-radius: 15px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #bd2130;
-            }
-        """)
+        exit_btn.setObjectName("exitBtn")
+        exit_btn.setStyleSheet(EXIT_BUTTON_STYLE)
         exit_btn.clicked.connect(self.close)
         
         exit_layout.addWidget(exit_btn)
         exit_container.show()
         
-        # Make sure the exit button stays in the top-right corner when window is resized
-        self.resizeEvent = self._handle_resize
+        # Repositioned directly in resizeEvent so it stays in the top-right corner
+        self._exit_container = exit_container
     
-    def _handle_resize(self, event):
+    def resizeEvent(self, event):
         """Keep the exit button in the top-right corner when window is resized"""
-        # Find the exit container
-        for child in self.children():
-            if isinstance(child, QWidget) and hasattr(child, 'layout'):
-                layout = child.layout()
-                if layout and layout.count() > 0:
-                    item = layout.itemAt(0)
-                    if item and isinstance(item.widget(), QPushButton) and item.widget().text() == "✕":
-                        # Found the exit container, update its position
-                        child.setGeometry(self.width() - 50, 10, 40, 40)
-        
-        # Call the original resize event
-        QMainWindow.resizeEvent(self, event)
+        self._exit_container.setGeometry(self.width() - 50, 10, 40, 40)
+        super().resizeEvent(event)
 
 def main():
+    _configure_logging()
     try:
         # Create application
         app = QApplication(sys.argv)
         
-        # Initialize Firebase first
-        firebase_status = initialize_firebase()
+        # Initialize Firebase first, with the credentials that last connected
+        firebase_status = initialize_firebase(saved_cred_path())
         if firebase_status:
             logger.info("Firebase initialized successfully at startup")
         else:
@@ -103,14 +102,17 @@ def main():
         window = FullscreenMainWindow()
         window.showMaximized()  # Start maximized instead of normal size
         
-        # If Firebase failed to initialize, show a warning
-        if not firebase_available() and window is not None:
-            QMessageBox.warning(
-                window, 
-                "Firebase Connection", 
-                "Failed to connect to Firebase. Some features will be disabled.\n\n"
-                "You can reconnect using the 'Connect to Firebase' button."
-            )
+        # If Firebase failed to initialize, show a warning (log only when headless)
+        if not firebase_available():
+            if _prompts_suppressed():
+                logger.warning("Firebase unavailable (prompt suppressed)")
+            elif window is not None:
+                QMessageBox.warning(
+                    window, 
+                    "Firebase Connection", 
+                    "Failed to connect to Firebase. Some features will be disabled.\n\n"
+                    "You can reconnect using the 'Connect to Firebase' button."
+                )
         
         return app.exec_()
     except Exception as e:
@@ -120,4 +122,7 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    if os.name == 'nt':
+        import ctypes
+        ctypes.windll.user32.ShowWindow(ctypes.windll.kernel32.GetConsoleWindow(), 0)
     main()
\ No newline at end of file
@@ -0,0 +1,42 @@
+# schedule_app/scripts/_firebase.py
+
+import os
+import logging
+import threading
+import firebase_admin
+from firebase_admin import credentials, firestore
+from core.config import CRED_FILE
+
+logger = logging.getLogger(__name__)
+
+# Shared Firestore client for every migration script run in this process
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    """Return the shared Firestore client, initializing Firebase on first use"""
+    global _db
+
+    with _db_lock:
+        if _db is not None:
+            return _db
+
+        try:
+            # Reuse an app someone else already initialized
+            if firebase_admin._apps:
+                app = firebase_admin.get_app()
+                logger.info("Using existing Firebase app")
+            else:
+                if not os.path.exists(CRED_FILE):
+                    logger.error(f"Firebase credentials file not found: {CRED_FILE}")
+                    return None
+
+                cred = credentials.Certificate(CRED_FILE)
+                app = firebase_admin.initialize_app(cred)
+                logger.info("Firebase initialized successfully")
+
+            _db = firestore.client(app=app)
+            return _db
+        except Exception as e:
+            logger.error(f"Failed to initialize Firebase: {str(e)}")
+            return None
@@ -1,13 +1,20 @@
 # schedule_app/scripts/firebase_migration.py
 
 import os
+import sys
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
-import firebase_admin
-from firebase_admin import credentials, firestore
+from functools import lru_cache
+import openpyxl
 from core.parser import parse_availability
+from scripts._firebase import get_db
+
+try:
+    import orjson  # optional, faster parsing of large data.json files
+except ImportError:
+    orjson = None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
@@ -17,9 +24,16 @@ logger = logging.getLogger("FirebaseMigration")
 # Base directory - adjust if needed
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_FILE = os.path.join(BASE_DIR, 'data.json')
-CRED_FILE = os.path.join(BASE_DIR, 'workplace-scheduler-ace38-firebase-adminsdk-fbsvc-4d7d358b05.json')
 WORKPLACES = ["esports_lounge", "esports_arena", "it_service_center"]
 WORKPLACES_DIR = os.path.join(BASE_DIR, 'workplaces')
+BATCH_SIZE = 450  # Keep under Firestore's 500 writes per batch
+MAX_COMMITS_IN_FLIGHT = 8
+
+# Full batches are committed here so the next batch can be built meanwhile
+_commit_pool = ThreadPoolExecutor(max_workers=MAX_COMMITS_IN_FLIGHT)
+
+class MigrationError(Exception):
+    """Raised when a migration step reports failure"""
 
 def load_local_data():
     """Load data from local JSON file"""
@@ -28,38 +42,83 @@ def load_local_data():
         return {}
     
     try:
-        with open(DATA_FILE, 'r') as f:
-            return json.load(f)
+        with open(DATA_FILE, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
     except Exception as e:
         logger.error(f"Error loading local data: {str(e)}")
         return {}
 
-def initialize_firebase():
-    """Initialize Firebase connection"""
-    if not os.path.exists(CRED_FILE):
-        logger.error(f"Firebase credentials file not found: {CRED_FILE}")
-        return None
+class BatchWriter:
+    """Collect Firestore writes and commit them BATCH_SIZE at a time"""
     
-    try:
-        # Check if already initialized
-        if firebase_admin._apps:
-            # Get existing app
-            app = firebase_admin.get_app()
-            db = firestore.client(app=app)
-            logger.info("Using existing Firebase app")
-            return db
-            
-        # Initialize Firebase
-        cred = credentials.Certificate(CRED_FILE)
-        app = firebase_admin.initialize_app(cred)
+    def __init__(self, db, batch_size=BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.batch = db.batch()
+        self.pending = 0
+        self.in_flight = []
+    
+    def set(self, ref, data):
+        self.batch.set(ref, data)
+        self._added()
+    
+    def update(self, ref, data):
+        self.batch.update(ref, data)
+        self._added()
+    
+    def _added(self):
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.in_flight.append(_commit_pool.submit(self.batch.commit))
+            self.batch = self.db.batch()
+            self.pending = 0
+    
+    def flush(self):
+        """Commit any queued writes and wait for the ones already in flight"""
+        if self.pending:
+            self.batch.commit()
+            self.batch = self.db.batch()
+            self.pending = 0
+        for future in self.in_flight:
+            future.result()
+        self.in_flight = []
+
+def load_existing_workers(workers_ref):
+    """Fetch a workplace's workers once and map email -> document id"""
+    existing = {}
+    for doc in workers_ref.get():
+        email = doc.to_dict().get('email')
+        if email:
+            existing[email] = doc.id
+    return existing
+
+def write_workers(db, workplace_id, unique):
+    """Write one set/update per unique email; returns the number written"""
+    writer = BatchWriter(db)
+    workers_ref = db.collection('workplaces').document(workplace_id).collection('workers')
+    existing = load_existing_workers(workers_ref)
+    
+    for email, worker_data in unique.items():
+        # Check if worker already exists in Firebase
+        doc_id = existing.get(email)
         
-        # Get Firestore client
-        db = firestore.client(app=app)
-        logger.info("Firebase initialized successfully")
-        return db
-    except Exception as e:
-        logger.error(f"Failed to initialize Firebase: {str(e)}")
-        return None
+        if doc_id:
+            # Update existing worker
+            writer.update(workers_ref.document(doc_id), worker_data)
+            logger.info(f"Updated existing worker {email} in {workplace_id}")
+        else:
+            # Create new worker
+            writer.set(workers_ref.document(), worker_data)
+            logger.info(f"Added new worker {email} to {workplace_id}")
+    
+    writer.flush()
+    return len(unique)
+
+def for_each_workplace(func, *args):
+    """Run func(workplace_id, *args) for every workplace concurrently; returns the results in order"""
+    with ThreadPoolExecutor(max_workers=len(WORKPLACES)) as executor:
+        return list(executor.map(lambda workplace_id: func(workplace_id, *args), WORKPLACES))
 
 def migrate_global_settings(db, data):
     """Migrate global settings to Firestore"""
@@ -85,6 +144,7 @@ def migrate_global_settings(db, data):
 def migrate_workplace_basic_info(db):
     """Create basic workplace documents"""
     try:
+        now_iso = datetime.now().isoformat()
         for workplace_id in WORKPLACES:
             # Format the name nicely
             name = workplace_id.replace('_', ' ').title()
@@ -93,7 +153,7 @@ def migrate_workplace_basic_info(db):
             workplace_ref = db.collection('workplaces').document(workplace_id)
             workplace_ref.set({
                 'name': name,
-                'created_at': datetime.now().isoformat()
+                'created_at': now_iso
             }, merge=True)
         
         logger.info(f"Created {len(WORKPLACES)} workplace documents")
@@ -137,258 +197,247 @@ def migrate_hours_of_operation(db, data):
 def migrate_workers_from_excel(db):
     """Migrate workers from Excel files to Firestore"""
     try:
-        total_workers = 0
-        
-        for workplace_id in WORKPLACES:
-            # Check if Excel file exists
-            excel_path = os.path.join(WORKPLACES_DIR, f"{workplace_id}.xlsx")
-            if not os.path.exists(excel_path):
-                logger.warning(f"No Excel file found for {workplace_id}")
-                continue
-            
-            # Read Excel file
-            try:
-                df = pd.read_excel(excel_path)
-                df.columns = df.columns.str.strip()
-                df = df.dropna(subset=['Email'], how='all')
-                df = df[df['Email'].str.strip() != '']
-                df = df[~df['Email'].str.contains('nan', case=False, na=False)]
-            except Exception as e:
-                logger.error(f"Error reading Excel file for {workplace_id}: {str(e)}")
-                continue
-            
-            # Process workers
-            worker_count = 0
+        now_iso = datetime.now().isoformat()
+        total_workers = sum(for_each_workplace(_migrate_workplace_workers_from_excel, db, now_iso))
+        logger.info(f"Total workers migrated from Excel: {total_workers}")
+        return True
+    except Exception as e:
+        logger.error(f"Error migrating workers from Excel: {str(e)}")
+        return False
+
+@lru_cache(maxsize=8)
+def _find_avail_col(columns):
+    """First column whose name mentions 'available' (workplace sheets share a header)"""
+    return next((c for c in columns if 'available' in c.lower()), None)
+
+def _cell_text(row, index):
+    """Cell value as a stripped string (blank for an empty or missing cell)"""
+    if index is None or index >= len(row) or row[index] is None:
+        return ''
+    return str(row[index]).strip()
+
+def _migrate_workplace_workers_from_excel(workplace_id, db, now_iso):
+    """Migrate one workplace's Excel workers; returns the number migrated"""
+    # Check if Excel file exists
+    excel_path = os.path.join(WORKPLACES_DIR, f"{workplace_id}.xlsx")
+    if not os.path.exists(excel_path):
+        logger.warning(f"No Excel file found for {workplace_id}")
+        return 0
+    
+    # Stream the sheet row by row, collecting one record per email (last row wins)
+    unique = {}
+    parsed_cache = {}
+    try:
+        wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(c).strip() if c is not None else '' for c in next(rows, ())]
+            idx = {h: i for i, h in enumerate(header)}
             
-            # Get availability column name
-            avail_col = next((c for c in df.columns if 'available' in c.lower()), None)
+            # Get availability column position
+            avail_col = _find_avail_col(tuple(header))
+            avail_idx = idx[avail_col] if avail_col else None
             
-            # Process each worker
-            for _, row in df.iterrows():
-                # Check if email exists (required field)
-                email = row.get('Email', '').strip()
-                if not email or pd.isna(email):
-                    logger.warning(f"Skipping worker with no email in {workplace_id}")
+            for row in rows:
+                # Skip rows without an email (required field)
+                email = _cell_text(row, idx.get('Email'))
+                if not email or email.lower() == 'nan':
                     continue
                 
-                # Parse availability
-                avail_text = str(row.get(avail_col, '')) if avail_col else ''
-                if pd.isna(avail_text) or avail_text.lower() == 'nan':
+                # Parse availability, once per distinct string
+                avail_text = _cell_text(row, avail_idx)
+                if avail_text.lower() == 'nan':
                     avail_text = ''
-                
-                parsed_avail = parse_availability(avail_text)
+                parsed_avail = parsed_cache.get(avail_text)
+                if parsed_avail is None:
+                    parsed_avail = parsed_cache[avail_text] = parse_availability(avail_text)
                 
                 # Create worker data
-                worker_data = {
-                    'first_name': row.get('First Name', '').strip(),
-                    'last_name': row.get('Last Name', '').strip(),
+                unique[email] = {
+                    'first_name': _cell_text(row, idx.get('First Name')),
+                    'last_name': _cell_text(row, idx.get('Last Name')),
                     'email': email,
-                    'work_study': str(row.get('Work Study', '')).strip().lower() in ['yes', 'y', 'true'],
+                    'work_study': _cell_text(row, idx.get('Work Study')).lower() in ('yes', 'y', 'true'),
                     'availability': parsed_avail,
                     'availability_text': avail_text,
-                    'created_at': datetime.now().isoformat(),
-                    'updated_at': datetime.now().isoformat()
+                    'created_at': now_iso,
+                    'updated_at': now_iso
                 }
-                
-                # Check if worker already exists in Firebase
-                query = db.collection('workplaces').document(workplace_id) \
-                          .collection('workers') \
-                          .where('email', '==', email) \
-                          .limit(1)
-                
-                existing_workers = list(query.stream())
-                
-                if existing_workers:
-                    # Update existing worker
-                    existing_worker = existing_workers[0]
-                    db.collection('workplaces').document(workplace_id) \
-                      .collection('workers').document(existing_worker.id) \
-                      .update(worker_data)
-                    logger.info(f"Updated existing worker {email} in {workplace_id}")
-                else:
-                    # Create new worker
-                    db.collection('workplaces').document(workplace_id) \
-                      .collection('workers').add(worker_data)
-                    logger.info(f"Added new worker {email} to {workplace_id}")
-                
-                worker_count += 1
-            
-            total_workers += worker_count
-            logger.info(f"Migrated {worker_count} workers for {workplace_id} from Excel")
-        
-        logger.info(f"Total workers migrated from Excel: {total_workers}")
-        return True
+        finally:
+            wb.close()
     except Exception as e:
-        logger.error(f"Error migrating workers from Excel: {str(e)}")
-        return False
+        logger.error(f"Error reading Excel file for {workplace_id}: {str(e)}")
+        return 0
+    
+    worker_count = write_workers(db, workplace_id, unique)
+    logger.info(f"Migrated {worker_count} workers for {workplace_id} from Excel")
+    return worker_count
 
 def migrate_workers_from_json(db, data):
     """Migrate workers from data.json to Firestore"""
     try:
-        total_workers = 0
-        
-        for workplace_id in WORKPLACES:
-            # Get workers from data.json
-            workers = []
-            
-            # First try to get from the workplace directly
-            if workplace_id in data and 'workers' in data[workplace_id]:
-                workers = data[workplace_id]['workers']
-                logger.info(f"Found workers directly in data for {workplace_id}")
-            # Then check in workplaces subdictionary
-            elif 'workplaces' in data and workplace_id in data['workplaces'] and 'workers' in data['workplaces'][workplace_id]:
-                workers = data['workplaces'][workplace_id]['workers']
-                logger.info(f"Found workers in workplaces section for {workplace_id}")
-            
-            if not workers:
-                logger.warning(f"No workers found in JSON for {workplace_id}")
-                continue
-            
-            # Process workers
-            worker_count = 0
-            
-            for worker in workers:
-                # Skip if no email (required field)
-                email = worker.get('email', '')
-                if not email:
-                    logger.warning(f"Skipping worker with no email in {workplace_id}")
-                    continue
-                
-                # Format availability if needed
-                if 'availability' not in worker or not isinstance(worker['availability'], dict):
-                    avail_text = worker.get('availability_text', '')
-                    if not avail_text and isinstance(worker.get('availability'), str):
-                        avail_text = worker['availability']
-                    
-                    worker['availability'] = parse_availability(avail_text)
-                    worker['availability_text'] = avail_text
-                
-                # Ensure timestamps
-                if 'created_at' not in worker:
-                    worker['created_at'] = datetime.now().isoformat()
-                if 'updated_at' not in worker:
-                    worker['updated_at'] = datetime.now().isoformat()
-                
-                # Normalize field names
-                if 'firstName' in worker and 'first_name' not in worker:
-                    worker['first_name'] = worker['firstName']
-                if 'lastName' in worker and 'last_name' not in worker:
-                    worker['last_name'] = worker['lastName']
-                if 'workStudy' in worker and 'work_study' not in worker:
-                    worker['work_study'] = worker['workStudy']
-                
-                # Check if worker already exists in Firebase
-                query = db.collection('workplaces').document(workplace_id) \
-                          .collection('workers') \
-                          .where('email', '==', email) \
-                          .limit(1)
-                
-                existing_workers = list(query.stream())
-                
-                if existing_workers:
-                    # Update existing worker
-                    existing_worker = existing_workers[0]
-                    db.collection('workplaces').document(workplace_id) \
-                      .collection('workers').document(existing_worker.id) \
-                      .update(worker)
-                    logger.info(f"Updated existing worker {email} in {workplace_id}")
-                else:
-                    # Create new worker
-                    db.collection('workplaces').document(workplace_id) \
-                      .collection('workers').add(worker)
-                    logger.info(f"Added new worker {email} to {workplace_id}")
-                
-                worker_count += 1
-            
-            total_workers += worker_count
-            logger.info(f"Migrated {worker_count} workers for {workplace_id} from JSON")
-        
+        now_iso = datetime.now().isoformat()
+        total_workers = sum(for_each_workplace(_migrate_workplace_workers_from_json, db, data, now_iso))
         logger.info(f"Total workers migrated from JSON: {total_workers}")
         return True
     except Exception as e:
         logger.error(f"Error migrating workers from JSON: {str(e)}")
         return False
 
-def migrate_saved_schedules(db, data):
-    """Migrate saved schedules to Firestore"""
-    try:
-        total_schedules = 0
+def _migrate_workplace_workers_from_json(workplace_id, db, data, now_iso):
+    """Migrate one workplace's data.json workers; returns the number migrated"""
+    # Get workers from data.json
+    workers = []
+    
+    # First try to get from the workplace directly
+    if workplace_id in data and 'workers' in data[workplace_id]:
+        workers = data[workplace_id]['workers']
+        logger.info(f"Found workers directly in data for {workplace_id}")
+    # Then check in workplaces subdictionary
+    elif 'workplaces' in data and workplace_id in data['workplaces'] and 'workers' in data['workplaces'][workplace_id]:
+        workers = data['workplaces'][workplace_id]['workers']
+        logger.info(f"Found workers in workplaces section for {workplace_id}")
+    
+    if not workers:
+        logger.warning(f"No workers found in JSON for {workplace_id}")
+        return 0
+    
+    # Collect one record per email, merging duplicates in file order
+    unique = {}
+    parsed_cache = {}
+    for worker in workers:
+        # Skip if no email (required field)
+        email = worker.get('email', '')
+        if not email:
+            logger.warning(f"Skipping worker with no email in {workplace_id}")
+            continue
         
-        for workplace_id in WORKPLACES:
-            # Get saved schedules from data.json
-            schedules = []
-            
-            # First try to get from the workplace directly
-            if workplace_id in data and 'saved_schedules' in data[workplace_id]:
-                schedules = data[workplace_id]['saved_schedules']
-                logger.info(f"Found schedules directly in data for {workplace_id}")
-            # Then check in workplaces subdictionary
-            elif 'workplaces' in data and workplace_id in data['workplaces'] and 'saved_schedules' in data['workplaces'][workplace_id]:
-                schedules = data['workplaces'][workplace_id]['saved_schedules']
-                logger.info(f"Found schedules in workplaces section for {workplace_id}")
-            
-            if not schedules:
-                logger.warning(f"No saved schedules found for {workplace_id}")
-                
-                # Check for current.json in saved_schedules directory
-                schedule_path = os.path.join(BASE_DIR, 'saved_schedules', f"{workplace_id}_current.json")
-                if os.path.exists(schedule_path):
-                    try:
-                        with open(schedule_path, 'r') as f:
-                            schedule_data = json.load(f)
-                            
-                            # Format for Firebase
-                            firebase_schedule = {
-                                'days': schedule_data,
-                                'created_at': datetime.now().isoformat(),
-                                'workplace_id': workplace_id,
-                                'name': f"{workplace_id} Schedule {datetime.now().strftime('%Y-%m-%d')}"
-                            }
-                            
-                            # Add to Firestore
-                            db.collection('workplaces').document(workplace_id) \
-                              .collection('schedules').add(firebase_schedule)
-                            
-                            logger.info(f"Migrated current schedule from file for {workplace_id}")
-                            total_schedules += 1
-                    except Exception as e:
-                        logger.error(f"Error loading schedule from file for {workplace_id}: {str(e)}")
-                
-                continue
-            
-            # Process schedules
-            schedule_count = 0
-            
-            for schedule in schedules:
-                # Add timestamp if not present
-                if 'created_at' not in schedule:
-                    schedule['created_at'] = datetime.now().isoformat()
-                
-                # Add workplace_id if not present
-                if 'workplace_id' not in schedule:
-                    schedule['workplace_id'] = workplace_id
-                
-                # Add name if not present
-                if 'name' not in schedule:
-                    schedule['name'] = f"{workplace_id} Schedule {schedule_count + 1}"
-                
-                # Create a new schedule document
-                db.collection('workplaces').document(workplace_id) \
-                  .collection('schedules').add(schedule)
-                
-                schedule_count += 1
+        # Format availability if needed
+        if 'availability' not in worker or not isinstance(worker['availability'], dict):
+            avail_text = worker.get('availability_text', '')
+            if not avail_text and isinstance(worker.get('availability'), str):
+                avail_text = worker['availability']
             
-            total_schedules += schedule_count
-            logger.info(f"Migrated {schedule_count} schedules for {workplace_id}")
+            parsed_avail = parsed_cache.get(avail_text)
+            if parsed_avail is None:
+                parsed_avail = parsed_cache[avail_text] = parse_availability(avail_text)
+            worker['availability'] = parsed_avail
+            worker['availability_text'] = avail_text
         
+        # Ensure timestamps
+        if 'created_at' not in worker:
+            worker['created_at'] = now_iso
+        if 'updated_at' not in worker:
+            worker['updated_at'] = now_iso
+        
+        # Normalize field names
+        if 'firstName' in worker and 'first_name' not in worker:
+            worker['first_name'] = worker['firstName']
+        if 'lastName' in worker and 'last_name' not in worker:
+            worker['last_name'] = worker['lastName']
+        if 'workStudy' in worker and 'work_study' not in worker:
+            worker['work_study'] = worker['workStudy']
+        
+        unique.setdefault(email, {}).update(worker)
+    
+    worker_count = write_workers(db, workplace_id, unique)
+    logger.info(f"Migrated {worker_count} workers for {workplace_id} from JSON")
+    return worker_count
+
+def migrate_saved_schedules(db, data):
+    """Migrate saved schedules to Firestore"""
+    try:
+        now_iso = datetime.now().isoformat()
+        total_schedules = sum(for_each_workplace(_migrate_workplace_schedules, db, data, now_iso))
         logger.info(f"Total schedules migrated: {total_schedules}")
         return True
     except Exception as e:
         logger.error(f"Error migrating schedules: {str(e)}")
         return False
 
-def run_migration():
-    """Run the complete migration process"""
+def _migrate_workplace_schedules(workplace_id, db, data, now_iso):
+    """Migrate one workplace's saved schedules; returns the number migrated"""
+    # Get saved schedules from data.json
+    schedules = []
+    
+    # First try to get from the workplace directly
+    if workplace_id in data and 'saved_schedules' in data[workplace_id]:
+        schedules = data[workplace_id]['saved_schedules']
+        logger.info(f"Found schedules directly in data for {workplace_id}")
+    # Then check in workplaces subdictionary
+    elif 'workplaces' in data and workplace_id in data['workplaces'] and 'saved_schedules' in data['workplaces'][workplace_id]:
+        schedules = data['workplaces'][workplace_id]['saved_schedules']
+        logger.info(f"Found schedules in workplaces section for {workplace_id}")
+    
+    writer = BatchWriter(db)
+    schedules_ref = db.collection('workplaces').document(workplace_id).collection('schedules')
+    
+    if not schedules:
+        logger.warning(f"No saved schedules found for {workplace_id}")
+        
+        # Check for current.json in saved_schedules directory
+        schedule_path = os.path.join(BASE_DIR, 'saved_schedules', f"{workplace_id}_current.json")
+        if not os.path.exists(schedule_path):
+            return 0
+        try:
+            with open(schedule_path, 'r') as f:
+                schedule_data = json.load(f)
+                
+                # Format for Firebase
+                firebase_schedule = {
+                    'days': schedule_data,
+                    'created_at': now_iso,
+                    'workplace_id': workplace_id,
+                    'name': f"{workplace_id} Schedule {now_iso[:10]}"
+                }
+                
+                # Add to Firestore
+                writer.set(schedules_ref.document(), firebase_schedule)
+                writer.flush()
+                
+                logger.info(f"Migrated current schedule from file for {workplace_id}")
+                return 1
+        except Exception as e:
+            logger.error(f"Error loading schedule from file for {workplace_id}: {str(e)}")
+            return 0
+    
+    # Process schedules
+    schedule_count = 0
+    
+    for schedule in schedules:
+        # Add timestamp if not present
+        if 'created_at' not in schedule:
+            schedule['created_at'] = now_iso
+        
+        # Add workplace_id if not present
+        if 'workplace_id' not in schedule:
+            schedule['workplace_id'] = workplace_id
+        
+        # Add name if not present
+        if 'name' not in schedule:
+            schedule['name'] = f"{workplace_id} Schedule {schedule_count + 1}"
+        
+        # Create a new schedule document
+        writer.set(schedules_ref.document(), schedule)
+        
+        schedule_count += 1
+    
+    writer.flush()
+    logger.info(f"Migrated {schedule_count} schedules for {workplace_id}")
+    return schedule_count
+
+def run_step(step_name, step_func):
+    """Run one migration step, raising MigrationError if it fails"""
+    logger.info(f"Running migration step: {step_name}")
+    if not step_func():
+        raise MigrationError(f"Migration step failed: {step_name}")
+    logger.info(f"Migration step completed: {step_name}")
+
+def run_migration(continue_on_error=False, progress_cb=None):
+    """Run the complete migration process, stopping at the first failed step
+    unless continue_on_error is set
+
+    progress_cb, if given, is called with a 0-100 percentage as steps finish."""
     logger.info("Starting Firebase migration...")
     
     # Load local data
@@ -397,7 +446,7 @@ def run_migration():
         logger.warning("No local data found in data.json. Will try other sources.")
     
     # Initialize Firebase
-    db = initialize_firebase()
+    db = get_db()
     if not db:
         logger.error("Failed to initialize Firebase. Migration aborted.")
         return False
@@ -412,14 +461,21 @@ def run_migration():
         ("Saved Schedules", lambda: migrate_saved_schedules(db, data))
     ]
     
+    if progress_cb:
+        progress_cb(10)
+    
     success = True
-    for step_name, step_func in steps:
-        logger.info(f"Running migration step: {step_name}")
-        if step_func():
-            logger.info(f"Migration step completed: {step_name}")
-        else:
-            logger.error(f"Migration step failed: {step_name}")
+    for i, (step_name, step_func) in enumerate(steps, start=1):
+        try:
+            run_step(step_name, step_func)
+        except MigrationError as e:
+            logger.error(str(e))
             success = False
+            if not continue_on_error:
+                logger.error("Migration aborted; remaining steps were skipped.")
+                return False
+        if progress_cb:
+            progress_cb(10 + 90 * i // len(steps))
     
     if success:
         logger.info("Firebase migration completed successfully!")
@@ -429,4 +485,4 @@ def run_migration():
     return success
 
 if __name__ == "__main__":
-    run_migration()
\ No newline at end of file
+    run_migration(continue_on_error='--continue-on-error' in sys.argv)
\ No newline at end of file
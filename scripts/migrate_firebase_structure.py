@@ -1,9 +1,9 @@
 # schedule_app/scripts/migrate_firebase_structure.py
 
 import logging
-import firebase_admin
-from firebase_admin import credentials, firestore
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from google.api_core.exceptions import AlreadyExists
 import time
 import os
 import sys
@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.firebase_utils import FirebaseUtils
 from core.parser import parse_availability
+from scripts._firebase import get_db
 
 # Configure logging
 logging.basicConfig(
@@ -26,39 +27,24 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def initialize_firebase():
-    """Initialize Firebase connection"""
-    try:
-        # Check if already initialized
-        if firebase_admin._apps:
-            # Get existing app
-            app = firebase_admin.get_app()
-            db = firestore.client(app=app)
-            logger.info("Using existing Firebase app")
-            return db
-        
-        # Look for credentials file
-        cred_file = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            'workplace-scheduler-ace38-firebase-adminsdk-fbsvc-4d7d358b05.json'
-        )
-        
-        if not os.path.exists(cred_file):
-            logger.error(f"Firebase credentials file not found: {cred_file}")
-            return None
-        
-        # Initialize Firebase
-        cred = credentials.Certificate(cred_file)
-        app = firebase_admin.initialize_app(cred)
-        
-        # Get Firestore client
-        db = firestore.client(app=app)
-        logger.info("Firebase initialized successfully")
-        return db
-        
-    except Exception as e:
-        logger.error(f"Failed to initialize Firebase: {e}")
-        return None
+# Fields of a flat-structure worker that FirebaseUtils.map_worker_from_firebase reads
+FLAT_WORKER_FIELDS = [
+    "First Name", "Last Name", "Email", "Work Study",
+    "Days & Times Available", "id", "created_at", "updated_at"
+]
+# select() parses each name as a field path, so quote them ("First Name" has a space)
+FLAT_WORKER_PATHS = [f"`{name}`" for name in FLAT_WORKER_FIELDS]
+
+def commit_with_retry(batch, attempts=5, delay=0.5):
+    """Commit a write batch, retrying with exponential backoff on failure"""
+    for attempt in range(attempts):
+        try:
+            return batch.commit()
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            logger.warning(f"Batch commit failed ({e}), retrying...")
+            time.sleep(delay * 2 ** attempt)
 
 def migrate_to_nested_structure(db):
     """
@@ -74,16 +60,17 @@ def migrate_to_nested_structure(db):
             # Normalize workplace ID
             workplace_id = FirebaseUtils.normalize_workplace_id(workplace_id)
             
-            # Create or update workplace document
+            # Create the workplace document if missing; create() rejects an
+            # existing document, so no read is needed first
             workplace_ref = db.collection('workplaces').document(workplace_id)
-            workplace_doc = workplace_ref.get()
-            
-            if not workplace_doc.exists:
-                workplace_ref.set({
+            try:
+                workplace_ref.create({
                     'name': workplace_id.replace('_', ' ').title(),
                     'created_at': datetime.now().isoformat()
                 })
                 logger.info(f"Created workplace document: {workplace_id}")
+            except AlreadyExists:
+                pass
             
             # Migrate hours of operation
             migrate_hours_of_operation(db, workplace_id, workplace_ref)
@@ -132,9 +119,9 @@ def migrate_workers(db, workplace_id, workplace_ref):
     Migrate workers from flat to nested structure
     """
     try:
-        # Get all workers in flat structure
-        workers_query = db.collection(workplace_id).where("Email", "!=", "").stream()
-        workers = list(workers_query)
+        # Get all workers in flat structure, fetching only the fields the mapping uses
+        workers_query = db.collection(workplace_id).where("Email", "!=", "").select(FLAT_WORKER_PATHS)
+        workers = workers_query.get()
         
         if not workers:
             logger.info(f"No workers found in flat structure for {workplace_id}")
@@ -145,45 +132,45 @@ def migrate_workers(db, workplace_id, workplace_ref):
         # Create workers subcollection
         workers_ref = workplace_ref.collection('workers')
         
-        # Process workers in batches
+        # Process workers in batches, committing them concurrently
         batch_size = 450  # Keep under 500 to be safe
         
-        for i in range(0, len(workers), batch_size):
-            batch = db.batch()
-            batch_workers = workers[i:i+batch_size]
-            
-            for worker_doc in batch_workers:
-                worker_data = worker_doc.to_dict()
-                
-                # Skip if not a worker document
-                if "Email" not in worker_data or not worker_data["Email"]:
-                    continue
-                
-                # Map to app format
-                app_worker = FirebaseUtils.map_worker_from_firebase(worker_data)
-                
-                # Ensure availability is parsed
-                if "availability" not in app_worker and "availability_text" in app_worker:
-                    app_worker["availability"] = parse_availability(app_worker["availability_text"])
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = {}
+            for i in range(0, len(workers), batch_size):
+                batch = db.batch()
+                batch_workers = workers[i:i+batch_size]
                 
-                # Add to nested structure
-                new_worker_ref = workers_ref.document()
+                for worker_doc in batch_workers:
+                    worker_data = worker_doc.to_dict()
+                    
+                    # Skip if not a worker document
+                    if "Email" not in worker_data or not worker_data["Email"]:
+                        continue
+                    
+                    # Map to app format
+                    app_worker = FirebaseUtils.map_worker_from_firebase(worker_data)
+                    
+                    # Ensure availability is parsed
+                    if "availability" not in app_worker and "availability_text" in app_worker:
+                        app_worker["availability"] = parse_availability(app_worker["availability_text"])
+                    
+                    # Add to nested structure
+                    new_worker_ref = workers_ref.document()
+                    
+                    # Map back to Firebase format
+                    firebase_worker = FirebaseUtils.map_worker_to_firebase(app_worker)
+                    
+                    # Add to batch
+                    batch.set(new_worker_ref, firebase_worker)
+                    
+                    # Note: We're not deleting from flat structure to be safe
                 
-                # Map back to Firebase format
-                firebase_worker = FirebaseUtils.map_worker_to_firebase(app_worker)
-                
-                # Add to batch
-                batch.set(new_worker_ref, firebase_worker)
-                
-                # Note: We're not deleting from flat structure to be safe
-            
-            # Commit the batch
-            batch.commit()
-            
-            logger.info(f"Migrated batch of {len(batch_workers)} workers for {workplace_id}")
+                futures[executor.submit(commit_with_retry, batch)] = len(batch_workers)
             
-            # Small delay to avoid overloading Firestore
-            time.sleep(0.5)
+            for future in as_completed(futures):
+                future.result()
+                logger.info(f"Migrated batch of {futures[future]} workers for {workplace_id}")
         
         logger.info(f"Successfully migrated {len(workers)} workers for {workplace_id}")
         return True
@@ -224,7 +211,7 @@ def run_migration():
     logger.info("Starting Firebase structure migration...")
     
     # Initialize Firebase
-    db = initialize_firebase()
+    db = get_db()
     if not db:
         logger.error("Failed to initialize Firebase. Migration aborted.")
         return False
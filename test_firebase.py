@@ -2,6 +2,7 @@
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 import firebase_admin
@@ -27,6 +28,15 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def wait_for(fetch, pred, timeout=2.0, step=0.05):
+    """Call fetch() until pred(result) holds or timeout seconds pass; returns the last result"""
+    deadline = time.monotonic() + timeout
+    result = fetch()
+    while not pred(result) and time.monotonic() < deadline:
+        time.sleep(step)
+        result = fetch()
+    return result
+
 def test_firebase_connection():
     """Test Firebase connection"""
     logger.info("Testing Firebase connection...")
@@ -52,13 +62,10 @@ def test_firebase_connection():
         logger.error("Firebase manager not initialized properly")
         return False
 
-def test_workplace_operations():
+def test_workplace_operations(firebase):
     """Test workplace operations"""
     logger.info("Testing workplace operations...")
     
-    # Get Firebase manager
-    firebase = FirebaseManager.get_instance()
-    
     # Test workplace setting
     workplace_id = "esports_lounge"
     
@@ -70,13 +77,10 @@ def test_workplace_operations():
     
     return True
 
-def test_worker_operations():
+def test_worker_operations(firebase):
     """Test worker operations"""
     logger.info("Testing worker operations...")
     
-    # Get Firebase manager
-    firebase = FirebaseManager.get_instance()
-    
     # Generate a unique email to avoid duplicates
     test_email = f"test.worker.{int(time.time())}@example.com"
     
@@ -89,9 +93,9 @@ def test_worker_operations():
         "availability_text": "Monday 09:00-17:00, Friday 12:00-18:00"
     }
     
-    # Get workers before adding
-    workers_before = firebase.get_workers()
-    logger.info(f"Found {len(workers_before)} workers before adding")
+    # Count workers before adding
+    count_before = firebase.count_workers()
+    logger.info(f"Found {count_before} workers before adding")
     
     # Add worker
     worker_id = firebase.add_worker(None, test_worker)
@@ -102,18 +106,18 @@ def test_worker_operations():
         logger.error("Failed to add worker")
         return False
     
-    # Get workers after adding
-    time.sleep(1)  # Small delay to ensure Firestore consistency
-    workers_after = firebase.get_workers()
-    logger.info(f"Found {len(workers_after)} workers after adding")
+    # Find the added worker
+    added_worker = wait_for(
+        lambda: firebase.get_worker_by_email(None, test_email),
+        lambda worker: worker is not None
+    )
     
     # Verify worker was added
-    if len(workers_after) != len(workers_before) + 1:
+    count_after = firebase.count_workers()
+    logger.info(f"Found {count_after} workers after adding")
+    if count_after != count_before + 1:
         logger.warning("Worker count mismatch after adding")
     
-    # Find the added worker
-    added_worker = next((w for w in workers_after if w.get("email") == test_email), None)
-    
     if added_worker:
         logger.info(f"Found added worker: {added_worker.get('first_name')} {added_worker.get('last_name')}")
     else:
@@ -137,24 +141,22 @@ def test_worker_operations():
             logger.error(f"Failed to delete worker with email: {test_email}")
             return False
     
-    # Get workers after deletion
-    time.sleep(1)  # Small delay to ensure Firestore consistency
-    workers_after_delete = firebase.get_workers()
-    logger.info(f"Found {len(workers_after_delete)} workers after deletion")
-    
     # Verify worker was deleted
-    if len(workers_after_delete) != len(workers_before):
+    wait_for(
+        lambda: firebase.get_worker_by_email(None, test_email),
+        lambda worker: worker is None
+    )
+    count_after_delete = firebase.count_workers()
+    logger.info(f"Found {count_after_delete} workers after deletion")
+    if count_after_delete != count_before:
         logger.warning("Worker count mismatch after deletion")
     
     return True
 
-def test_hours_operations():
+def test_hours_operations(firebase):
     """Test hours of operation"""
     logger.info("Testing hours of operation...")
     
-    # Get Firebase manager
-    firebase = FirebaseManager.get_instance()
-    
     # Get current hours of operation
     current_hours = firebase.get_hours_of_operation()
     logger.info(f"Current hours of operation: {json.dumps(current_hours)}")
@@ -170,6 +172,11 @@ def test_hours_operations():
         "Sunday": []
     }
     
+    # Nothing to write (or restore) when the workplace already has the test hours
+    if current_hours == test_hours:
+        logger.info("Hours of operation already match the test hours; skipping update")
+        return True
+    
     # Update hours of operation
     if firebase.update_hours_of_operation(None, test_hours):
         logger.info("Successfully updated hours of operation")
@@ -178,7 +185,6 @@ def test_hours_operations():
         return False
     
     # Get updated hours of operation
-    time.sleep(1)  # Small delay to ensure Firestore consistency
     updated_hours = firebase.get_hours_of_operation()
     logger.info(f"Updated hours of operation: {json.dumps(updated_hours)}")
     
@@ -192,13 +198,10 @@ def test_hours_operations():
     
     return True
 
-def test_schedule_operations():
+def test_schedule_operations(firebase):
     """Test schedule operations"""
     logger.info("Testing schedule operations...")
     
-    # Get Firebase manager
-    firebase = FirebaseManager.get_instance()
-    
     # Create test schedule
     test_schedule = {
         "days": {
@@ -231,13 +234,11 @@ def test_schedule_operations():
         logger.error("Failed to save schedule")
         return False
     
-    # Get schedules
-    time.sleep(1)  # Small delay to ensure Firestore consistency
-    schedules = firebase.get_schedules()
-    logger.info(f"Found {len(schedules)} schedules")
-    
-    # Find the saved schedule
-    saved_schedule = next((s for s in schedules if s.get("name") == "Test Schedule"), None)
+    # Read the saved schedule back by ID
+    saved_schedule = wait_for(
+        lambda: firebase.get_schedule(None, schedule_id),
+        lambda schedule: schedule is not None and schedule.get("name") == "Test Schedule"
+    )
     
     if saved_schedule:
         logger.info(f"Found saved schedule: {saved_schedule.get('name')}")
@@ -247,30 +248,38 @@ def test_schedule_operations():
     
     return True
 
+def run_test(test_name, test_func, *args):
+    """Run one test, returning (test_name, success)"""
+    logger.info(f"\n=== Running Test: {test_name} ===")
+    try:
+        success = test_func(*args)
+        logger.info(f"=== Test: {test_name} - {'PASSED' if success else 'FAILED'} ===\n")
+    except Exception as e:
+        logger.exception(f"Error running test {test_name}: {e}")
+        success = False
+        logger.info(f"=== Test: {test_name} - FAILED (exception) ===\n")
+    return test_name, success
+
 def run_tests():
     """Run all Firebase tests"""
     logger.info("Starting Firebase tests...")
     
-    tests = [
-        ("Firebase Connection", test_firebase_connection),
-        ("Workplace Operations", test_workplace_operations),
+    # The connection test initializes Firebase; the rest share one manager
+    results = [run_test("Firebase Connection", test_firebase_connection)]
+    firebase = FirebaseManager.get_instance()
+    
+    # Workplace selection sets the manager's current workplace, so it runs next
+    results.append(run_test("Workplace Operations", test_workplace_operations, firebase))
+    
+    # These touch separate collections, so their Firestore round trips can overlap
+    independent_tests = [
         ("Worker Operations", test_worker_operations),
         ("Hours Operations", test_hours_operations),
         ("Schedule Operations", test_schedule_operations)
     ]
     
-    results = []
-    
-    for test_name, test_func in tests:
-        logger.info(f"\n=== Running Test: {test_name} ===")
-        try:
-            success = test_func()
-            results.append((test_name, success))
-            logger.info(f"=== Test: {test_name} - {'PASSED' if success else 'FAILED'} ===\n")
-        except Exception as e:
-            logger.exception(f"Error running test {test_name}: {e}")
-            results.append((test_name, False))
-            logger.info(f"=== Test: {test_name} - FAILED (exception) ===\n")
+    with ThreadPoolExecutor(max_workers=len(independent_tests)) as executor:
+        results.extend(executor.map(lambda test: run_test(*test, firebase), independent_tests))
     
     # Print summary
     logger.info("\n=== Test Results Summary ===")
@@ -0,0 +1,36 @@
+# schedule_app/tests/test_scheduler.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parser import parse_availability
+from core.scheduler import create_shifts_from_availability
+
+def _worker(name, availability):
+    return {
+        "first_name": name,
+        "last_name": "Test",
+        "email": f"{name.lower()}@example.com",
+        "work_study": False,
+        "availability": parse_availability(availability),
+    }
+
+def test_two_workers_cover_twelve_hour_day():
+    """Two workers available all day share every shift of a 12 hour window"""
+    hours = {"Monday": [{"start": "08:00", "end": "20:00"}]}
+    workers = [_worker("Ann", "Monday 08:00-20:00"), _worker("Bob", "Monday 08:00-20:00")]
+
+    for seed in range(20):
+        schedule, assigned_hours, *_, unfilled, _, _ = create_shifts_from_availability(
+            hours, workers, max_hours_per_worker=20, max_workers_per_shift=1,
+            min_hours_per_worker=3, seed=seed
+        )
+        assert unfilled == []
+        assert sum(assigned_hours.values()) == 12
+
+        # Nobody works back-to-back shifts
+        shifts = sorted(schedule["Monday"], key=lambda s: s["start_hour"])
+        for prev, nxt in zip(shifts, shifts[1:]):
+            assert not set(prev["raw_assigned"]) & set(nxt["raw_assigned"])
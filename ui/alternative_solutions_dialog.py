@@ -2,28 +2,139 @@
 
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QGroupBox, QScrollArea,
-    QWidget, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
-    QHeaderView, QFileDialog, QMessageBox
+    QWidget, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QMessageBox, QTableView
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QAbstractTableModel, QObject, QRunnable, QThreadPool, pyqtSignal
 from core.parser import format_time_ampm
 from core.config import firebase_available
 from .style_helper import StyleHelper
 import logging
-import pandas as pd
-import os
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+def _work_study_rows(work_study_issues):
+    """(Student, Issue, Recommendation) rows for the export"""
+    for student_issue in work_study_issues:
+        # Parse out the issue if it exists
+        if ":" in student_issue:
+            student, issue = student_issue.split(":", 1)
+            yield student.strip(), issue.strip(), 'Check availability or adjust schedule'
+        else:
+            yield student_issue, 'Does not have exactly 5 hours', 'Adjust shifts to equal 5 hours total'
+
+def _unfilled_shift_rows(formatted_shifts):
+    """(Day, Start Time, End Time, Potential Workers, Suggestion) rows for the export"""
+    for shift, start, end, key, alternatives in formatted_shifts:
+        yield (
+            shift['day'], start, end,
+            ', '.join(alternatives) if alternatives else 'None',
+            'Increase max hours or find additional workers' if alternatives else 'Recruit more workers or adjust hours'
+        )
+
+def write_suggestions_workbook(file_path, formatted_shifts, work_study_issues):
+    """Write the suggestions workbook, streaming rows to disk as they are produced"""
+    # Imported here: opening the dialog is common, exporting is rare
+    import openpyxl
+    
+    sheets = []
+    if work_study_issues:
+        sheets.append(('Work Study Issues', ('Student', 'Issue', 'Recommendation'),
+                       _work_study_rows(work_study_issues)))
+    if formatted_shifts:
+        sheets.append(('Unfilled Shifts', ('Day', 'Start Time', 'End Time', 'Potential Workers', 'Suggestion'),
+                       _unfilled_shift_rows(formatted_shifts)))
+    sheets.append(('Summary', ('Total Unfilled Shifts', 'Total Work Study Issues', 'Generated On'),
+                   [(len(formatted_shifts), len(work_study_issues), datetime.now().strftime('%Y-%m-%d %H:%M'))]))
+    
+    # Write-only workbooks keep just the current row in memory
+    wb = openpyxl.Workbook(write_only=True)
+    for name, headers, rows in sheets:
+        ws = wb.create_sheet(name)
+        ws.append(headers)
+        for row in rows:
+            ws.append(row)
+    wb.save(file_path)
+
+class ExportSignals(QObject):
+    """Signals ExportTask emits back on the UI thread"""
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+class ExportTask(QRunnable):
+    """Write the suggestions workbook on a thread-pool thread"""
+    
+    def __init__(self, file_path, formatted_shifts, work_study_issues):
+        super().__init__()
+        self.file_path = file_path
+        self.formatted_shifts = formatted_shifts
+        self.work_study_issues = work_study_issues
+        self.signals = ExportSignals()
+    
+    def run(self):
+        try:
+            write_suggestions_workbook(
+                self.file_path, self.formatted_shifts, self.work_study_issues
+            )
+        except Exception as e:
+            logger.error(f"Error exporting suggestions: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.file_path)
+
+class SuggestionsModel(QAbstractTableModel):
+    """Read-only (Day, Time, Worker, Reason) rows for every unfilled shift"""
+    
+    HEADERS = ["Day", "Time", "Worker", "Reason"]
+    
+    def __init__(self, formatted_shifts, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        seen = set()
+        for u, start, end, key, sols in formatted_shifts:
+            # Shifts missing several workers appear once per open seat
+            if key in seen:
+                continue
+            seen.add(key)
+            time_range = f"{start}–{end}"
+            if sols:
+                for worker in sols:
+                    self._rows.append((u['day'], time_range, worker, "Exceeds max hours limit"))
+            else:
+                self._rows.append((u['day'], time_range, "⚠️ None available", "No alternatives for this shift"))
+    
+    def rowCount(self, parent=None):
+        return len(self._rows)
+    
+    def columnCount(self, parent=None):
+        return len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
 class AlternativeSolutionsDialog(QDialog):
     def __init__(self, alternative_solutions, unfilled_shifts, work_study_issues=None, parent=None):
         super().__init__(parent)
         self.alternative_solutions = alternative_solutions
         self.unfilled_shifts = unfilled_shifts
         self.work_study_issues = work_study_issues or []
+        # (shift, start AM/PM, end AM/PM, solutions key, solutions), shared by the view and the export
+        self._formatted = []
+        for u in unfilled_shifts:
+            key = f"{u['day']} {u['start']}-{u['end']}"
+            self._formatted.append((u, format_time_ampm(u['start']), format_time_ampm(u['end']),
+                                    key, alternative_solutions.get(key, ())))
         self.firebase_available = firebase_available()
         self.parent = parent
+        self._export_task = None
         self.initUI()
 
     def initUI(self):
@@ -54,6 +165,9 @@ class AlternativeSolutionsDialog(QDialog):
             ws_table.setHorizontalHeaderLabels(["Student", "Issue"])
             ws_table.setRowCount(len(self.work_study_issues))
             
+            # Fill without a repaint or signal per cell
+            ws_table.setUpdatesEnabled(False)
+            ws_table.blockSignals(True)
             for i, student_issue in enumerate(self.work_study_issues):
                 # Check if this contains an explicit issue message
                 if ":" in student_issue:
@@ -64,6 +178,8 @@ class AlternativeSolutionsDialog(QDialog):
                     # Default case for backward compatibility
                     ws_table.setItem(i, 0, QTableWidgetItem(student_issue))
                     ws_table.setItem(i, 1, QTableWidgetItem("Adjust shifts to equal 5 hours total"))
+            ws_table.blockSignals(False)
+            ws_table.setUpdatesEnabled(True)
             
             ws_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
             gl_ws.addWidget(ws_table)
@@ -87,39 +203,18 @@ class AlternativeSolutionsDialog(QDialog):
             summary.setStyleSheet("font-size:14px; color:#dc3545; font-weight:bold;")
             cl.addWidget(summary)
             
-            for u in self.unfilled_shifts:
-                day   = u['day']
-                start = format_time_ampm(u['start'])
-                end   = format_time_ampm(u['end'])
-                gb = QGroupBox(f"{day} {start}–{end}")
-                gl = QVBoxLayout(gb)
-                key = f"{u['day']} {u['start']}-{u['end']}"
-                sols = self.alternative_solutions.get(key, [])
-                
-                if sols:
-                    gl.addWidget(QLabel("These workers could cover if hours increased:"))
-                    
-                    # Create a table for potential workers
-                    workers_table = QTableWidget()
-                    workers_table.setColumnCount(2)
-                    workers_table.setHorizontalHeaderLabels(["Worker", "Reason"])
-                    workers_table.setRowCount(len(sols))
-                    
-                    for i, worker in enumerate(sols):
-                        workers_table.setItem(i, 0, QTableWidgetItem(worker))
-                        workers_table.setItem(i, 1, QTableWidgetItem("Exceeds max hours limit"))
-                    
-                    workers_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-                    gl.addWidget(workers_table)
-                    
-                    gl.addWidget(QLabel("Suggestion: Increase max hours or reassign shifts to balance workload."))
-                else:
-                    no_workers = QLabel("⚠️ No alternatives available for this shift.")
-                    no_workers.setStyleSheet("color:#dc3545; font-weight:bold;")
-                    gl.addWidget(no_workers)
-                    gl.addWidget(QLabel("Suggestion: Adjust hours of operation or recruit more workers."))
-                
-                cl.addWidget(gb)
+            # One virtualized view for every shift instead of a table widget per shift
+            gl_shifts = QVBoxLayout()
+            gl_shifts.addWidget(QLabel("Workers who could cover each shift if their hours increased:"))
+            shifts_view = QTableView()
+            shifts_view.setModel(SuggestionsModel(self._formatted, shifts_view))
+            shifts_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+            shifts_view.verticalHeader().setVisible(False)
+            shifts_view.setMinimumHeight(250)
+            gl_shifts.addWidget(shifts_view)
+            gl_shifts.addWidget(QLabel("Suggestion: Increase max hours or reassign shifts to balance workload; "
+                                       "where no one is available, adjust hours of operation or recruit more workers."))
+            cl.addLayout(gl_shifts)
 
         content.setLayout(cl)
         scroll.setWidget(content)
@@ -129,9 +224,9 @@ class AlternativeSolutionsDialog(QDialog):
         button_layout = QHBoxLayout()
         
         # Export button
-        export_btn = StyleHelper.create_button("Export Suggestions")
-        export_btn.clicked.connect(self.export_suggestions)
-        button_layout.addWidget(export_btn)
+        self.export_btn = StyleHelper.create_button("Export Suggestions")
+        self.export_btn.clicked.connect(self.export_suggestions)
+        button_layout.addWidget(self.export_btn)
         
         button_layout.addStretch()
         
@@ -160,83 +255,33 @@ class AlternativeSolutionsDialog(QDialog):
             if not file_path.lower().endswith('.xlsx'):
                 file_path += '.xlsx'
             
-            # Create Excel writer
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                # Work study issues
-                if self.work_study_issues:
-                    ws_data = []
-                    for student_issue in self.work_study_issues:
-                        # Parse out the issue if it exists
-                        if ":" in student_issue:
-                            student, issue = student_issue.split(":", 1)
-                            ws_data.append({
-                                'Student': student.strip(),
-                                'Issue': issue.strip(),
-                                'Recommendation': 'Check availability or adjust schedule'
-                            })
-                        else:
-                            ws_data.append({
-                                'Student': student_issue,
-                                'Issue': 'Does not have exactly 5 hours',
-                                'Recommendation': 'Adjust shifts to equal 5 hours total'
-                            })
-                    
-                    pd.DataFrame(ws_data).to_excel(
-                        writer, 
-                        sheet_name='Work Study Issues',
-                        index=False
-                    )
-                
-                # Unfilled shifts
-                if self.unfilled_shifts:
-                    shifts_data = []
-                    for shift in self.unfilled_shifts:
-                        day = shift['day']
-                        start = format_time_ampm(shift['start'])
-                        end = format_time_ampm(shift['end'])
-                        key = f"{day} {shift['start']}-{shift['end']}"
-                        
-                        alternatives = self.alternative_solutions.get(key, [])
-                        alternatives_str = ', '.join(alternatives) if alternatives else 'None'
-                        
-                        shifts_data.append({
-                            'Day': day,
-                            'Start Time': start,
-                            'End Time': end,
-                            'Potential Workers': alternatives_str,
-                            'Suggestion': 'Increase max hours or find additional workers' if alternatives else 'Recruit more workers or adjust hours'
-                        })
-                    
-                    pd.DataFrame(shifts_data).to_excel(
-                        writer, 
-                        sheet_name='Unfilled Shifts',
-                        index=False
-                    )
-                
-                # Summary sheet
-                summary_data = [{
-                    'Total Unfilled Shifts': len(self.unfilled_shifts),
-                    'Total Work Study Issues': len(self.work_study_issues),
-                    'Generated On': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M'),
-                }]
-                
-                pd.DataFrame(summary_data).to_excel(
-                    writer,
-                    sheet_name='Summary',
-                    index=False
-                )
-            
-            # Show success message
-            QMessageBox.information(
-                self,
-                "Export Complete",
-                f"Suggestions exported successfully to:\n{file_path}"
+            # Write on a pool thread so the dialog stays responsive
+            self._export_task = ExportTask(
+                file_path, self._formatted, self.work_study_issues
             )
+            self._export_task.signals.finished.connect(self._on_export_finished)
+            self._export_task.signals.failed.connect(self._on_export_failed)
+            self.export_btn.setEnabled(False)
+            QThreadPool.globalInstance().start(self._export_task)
             
         except Exception as e:
             logger.error(f"Error exporting suggestions: {e}")
-            QMessageBox.critical(
-                self, 
-                "Export Error", 
-                f"Failed to export suggestions: {str(e)}"
-            )
\ No newline at end of file
+            self._on_export_failed(str(e))
+    
+    def _on_export_finished(self, file_path):
+        """Show success message once the export task is done"""
+        self.export_btn.setEnabled(True)
+        QMessageBox.information(
+            self,
+            "Export Complete",
+            f"Suggestions exported successfully to:\n{file_path}"
+        )
+    
+    def _on_export_failed(self, error):
+        """Report an export error"""
+        self.export_btn.setEnabled(True)
+        QMessageBox.critical(
+            self, 
+            "Export Error", 
+            f"Failed to export suggestions: {error}"
+        )
\ No newline at end of file
@@ -1,31 +1,120 @@
 # schedule_app/ui/hours_of_operation_dialog.py
 
 import os
+import logging
+import threading
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QScrollArea, QWidget, QFormLayout, QMessageBox, QTimeEdit,
-    QProgressDialog, QCheckBox
+    QProgressDialog, QCheckBox, QGridLayout
 )
-from PyQt5.QtCore import QTime, Qt
+from PyQt5.QtCore import QTime, Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from core.data import load_data, save_data, get_data_manager
 from core.config import DAYS, firebase_available
+from core.firebase_manager import FirebaseManager
 from .style_helper import StyleHelper
 
+logger = logging.getLogger(__name__)
+
+# Time formats: 12-hour in the editors, 24-hour in stored data
+_DISPLAY_FMT = "h:mm AP"
+_STORE_FMT = "HH:mm"
+
+def _to_qtime(text):
+    """'HH:MM' -> QTime built from its fields (an invalid QTime if malformed)"""
+    try:
+        h, m = text.split(':')
+        return QTime(int(h), int(m))
+    except (AttributeError, ValueError):
+        return QTime()
+
+def _save_local(workplace, new):
+    """Write the hours into the local data.json"""
+    data = load_data()
+    data.setdefault(workplace, {})['hours_of_operation'] = new
+    return save_data(data)
+
+class SaveLocalTask(QRunnable):
+    """Write the hours into data.json on its own pool thread"""
+    
+    def __init__(self, workplace, hours):
+        super().__init__()
+        self.setAutoDelete(False)  # SaveHoursTask reads the result back
+        self.workplace = workplace
+        self.hours = hours
+        self.success = False
+        self.done = threading.Event()
+    
+    def run(self):
+        try:
+            self.success = _save_local(self.workplace, self.hours)
+        finally:
+            self.done.set()
+
+class SaveHoursSignals(QObject):
+    """Signals SaveHoursTask emits back on the UI thread"""
+    done = pyqtSignal(bool, bool)  # firebase_success, local_success
+
+class SaveHoursTask(QRunnable):
+    """Save hours to Firebase (optionally) and data.json off the UI thread"""
+    
+    def __init__(self, workplace, hours, save_to_firebase):
+        super().__init__()
+        self.workplace = workplace
+        self.hours = hours
+        self.save_to_firebase = save_to_firebase
+        self.signals = SaveHoursSignals()
+    
+    def run(self):
+        # Always save locally as backup
+        local = SaveLocalTask(self.workplace, self.hours)
+        
+        firebase_success = False
+        if self.save_to_firebase:
+            # Both writes are I/O-bound, so data.json is written on a second pool
+            # thread while this one waits on Firestore (inline if none is free)
+            if not QThreadPool.globalInstance().tryStart(local):
+                local.run()
+            try:
+                # Merge just the hours into the workplace document; the local copy is
+                # written once by SaveLocalTask (the data manager would also rewrite data.json)
+                firebase_success = FirebaseManager.get_instance().update_hours_of_operation(
+                    self.workplace, self.hours
+                )
+            except Exception as e:
+                logger.error(f"Error saving hours to Firebase: {e}")
+        else:
+            local.run()
+        
+        local.done.wait()
+        self.signals.done.emit(firebase_success, local.success)
+
 class HoursOfOperationDialog(QDialog):
     """Single-window hours-of-operation for each day."""
     def __init__(self, workplace, hours_data, parent=None):
         super().__init__(parent)
         self.workplace = workplace
+        self._title = workplace.replace('_', ' ').title()
         # hours_data: {day: [ {start, end}, ... ] }
         # we only take the first block if present
         self.hours_data = hours_data or {}
+        # Parsed (start, end) QTimes of each day's first block
+        self._parsed = {}
+        for day, blocks in self.hours_data.items():
+            if blocks:
+                self._parsed[day] = (_to_qtime(blocks[0]['start']), _to_qtime(blocks[0]['end']))
         self.day_widgets = {}
+        # What the last save asked for and where it landed, so the caller
+        # only retries a write that was wanted and failed
+        self.firebase_requested = False
+        self.saved_to_firebase = False
+        self.saved_locally = False
         self.data_manager = get_data_manager()
         self.firebase_available = firebase_available()
         self.initUI()
 
     def initUI(self):
-        self.setWindowTitle(f"Hours of Operation - {self.workplace.replace('_',' ').title()}")
+        self.setWindowTitle(f"Hours of Operation - {self._title}")
         self.setMinimumSize(500, 600)
         layout = QVBoxLayout(self)
 
@@ -42,43 +131,36 @@ class HoursOfOperationDialog(QDialog):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         content = QWidget()
-        sl = QVBoxLayout(content)
-        sl.setContentsMargins(0,0,0,0)
-
-        for day in DAYS:
-            row = QWidget()
-            hl = QHBoxLayout(row)
-            hl.setContentsMargins(4,4,4,4)
+        # One grid for all days instead of a layout per row
+        grid = QGridLayout(content)
+        grid.setContentsMargins(4,4,4,4)
 
+        for row, day in enumerate(DAYS):
             lbl = QLabel(day)
             lbl.setFixedWidth(80)
-            hl.addWidget(lbl)
+            grid.addWidget(lbl, row, 0)
 
             start_edit = QTimeEdit()
             # switch to 12-hour display with AM/PM
-            start_edit.setDisplayFormat("h:mm AP")
+            start_edit.setDisplayFormat(_DISPLAY_FMT)
             end_edit   = QTimeEdit()
-            end_edit.setDisplayFormat("h:mm AP")
+            end_edit.setDisplayFormat(_DISPLAY_FMT)
 
             # populate existing if any
-            blocks = self.hours_data.get(day, [])
-            if blocks:
-                b = blocks[0]
-                st = QTime.fromString(b['start'], "HH:mm")
-                en = QTime.fromString(b['end'],   "HH:mm")
+            if day in self._parsed:
+                st, en = self._parsed[day]
                 if st.isValid(): start_edit.setTime(st)
                 if en.isValid(): end_edit.setTime(en)
 
-            hl.addWidget(QLabel("Start:"))
-            hl.addWidget(start_edit)
-            hl.addWidget(QLabel("End:"))
-            hl.addWidget(end_edit)
-            hl.addStretch()
+            grid.addWidget(QLabel("Start:"), row, 1)
+            grid.addWidget(start_edit, row, 2)
+            grid.addWidget(QLabel("End:"), row, 3)
+            grid.addWidget(end_edit, row, 4)
 
-            sl.addWidget(row)
             self.day_widgets[day] = (start_edit, end_edit)
 
-        content.setLayout(sl)
+        grid.setColumnStretch(5, 1)
+        grid.setRowStretch(len(DAYS), 1)
         scroll.setWidget(content)
         layout.addWidget(scroll)
 
@@ -103,8 +185,8 @@ class HoursOfOperationDialog(QDialog):
         new = {}
         for day, (st, en) in self.day_widgets.items():
             new[day] = [{
-                "start": st.time().toString("HH:mm"),
-                "end":   en.time().toString("HH:mm")
+                "start": st.time().toString(_STORE_FMT),
+                "end":   en.time().toString(_STORE_FMT)
             }]
 
         # Show progress dialog
@@ -118,41 +200,26 @@ class HoursOfOperationDialog(QDialog):
             hasattr(self, 'use_firebase_checkbox') and self.use_firebase_checkbox.isChecked()
         )
 
-        # Save to Firebase if enabled and selected
-        firebase_success = False
-        if save_to_firebase:
-            progress.setValue(30)
-            progress.setLabelText("Saving to Firebase...")
-            
-            try:
-                # Make sure the data manager is using the correct workplace
-                self.data_manager.current_workplace_id = self.workplace
-                
-                # Update hours of operation in Firebase
-                firebase_success = self.data_manager.update_hours_of_operation(new)
-                
-                if firebase_success:
-                    progress.setValue(60)
-                    progress.setLabelText("Successfully saved to Firebase")
-                else:
-                    progress.setValue(60)
-                    progress.setLabelText("Failed to save to Firebase, saving locally...")
-            except Exception as e:
-                import logging
-                logging.error(f"Error saving hours to Firebase: {e}")
-                progress.setValue(60)
-                progress.setLabelText("Error saving to Firebase, saving locally...")
-                firebase_success = False
+        # Save to Firebase (if enabled and selected) and locally on a pool thread
+        # so the progress dialog keeps repainting while the writes run
+        progress.setValue(30)
+        progress.setLabelText("Saving to Firebase and locally..." if save_to_firebase else "Saving locally...")
         
-        # Always save locally as backup
-        progress.setValue(70)
-        progress.setLabelText("Saving locally...")
-        
-        data = load_data()
-        data.setdefault(self.workplace, {})['hours_of_operation'] = new
-        local_success = save_data(data)
-        
-        progress.setValue(100)
+        self._progress = progress
+        self._save_task = SaveHoursTask(self.workplace, new, save_to_firebase)
+        self._save_task.signals.done.connect(
+            lambda firebase_success, local_success: self._finish_save(
+                new, save_to_firebase, firebase_success, local_success
+            )
+        )
+        QThreadPool.globalInstance().start(self._save_task)
+
+    def _finish_save(self, new, save_to_firebase, firebase_success, local_success):
+        """Report the result of a SaveHoursTask"""
+        self._progress.setValue(100)
+        self.firebase_requested = save_to_firebase
+        self.saved_to_firebase = firebase_success
+        self.saved_locally = local_success
         
         # Check results and show appropriate message
         if local_success or firebase_success:
@@ -170,4 +237,5 @@ class HoursOfOperationDialog(QDialog):
             
             self.accept()
         else:
-            QMessageBox.critical(self, "Error", "Failed to save hours to disk or Firebase.")
\ No newline at end of file
+            QMessageBox.critical(self, "Error", "Failed to save hours to disk or Firebase.")
+
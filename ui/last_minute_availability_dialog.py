@@ -1,27 +1,110 @@
 # schedule_app/ui/last_minute_availability_dialog.py
 
-import os, logging, pandas as pd
+import os, re, sys, logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QFormLayout, QHBoxLayout,
-    QComboBox, QTimeEdit, QPushButton, QTableWidget,
+    QComboBox, QTimeEdit, QStyledItemDelegate, QTableWidget,
     QTableWidgetItem, QHeaderView, QMessageBox, QProgressDialog,
-    QCheckBox, QWidget  # Added QWidget to the imports
+    QCheckBox
 )
-from PyQt5.QtCore import QTime, Qt
+from PyQt5.QtCore import QEvent, QTime, QTimer, QUrl, Qt
+from PyQt5.QtGui import QBrush, QColor, QDesktopServices
 from .style_helper import StyleHelper
 from core.config import DIRS, firebase_available
 from core.parser import parse_availability, format_time_ampm
+from core.scheduler import build_availability_index, available_worker_indexes
 from core.data import get_data_manager
+from core.worker_cache import load_cached, save_cached
 
 logger = logging.getLogger(__name__)
 
 DAYS = ["Sunday","Monday","Tuesday","Wednesday","Thursday","Friday","Saturday"]
 
+EMAIL_BUTTON_BRUSH = QBrush(QColor("#007bff"))
+WORK_STUDY_BRUSH = QBrush(Qt.yellow)
+
+WORKER_COLUMNS = {"First Name", "Last Name", "Email", "Work Study"}
+_AVAIL_RE = re.compile(r'available', re.IGNORECASE)
+
+def _is_worker_column(name):
+    """True for the sheet columns this dialog reads"""
+    name = str(name).strip()
+    return name in WORKER_COLUMNS or _AVAIL_RE.search(name) is not None
+
+def _read_worker_sheet(path):
+    """Only the worker columns of a workplace sheet, as strings"""
+    import pandas as pd  # deferred: only Excel loads need it
+    try:
+        # calamine (python-calamine, pandas >= 2.2) parses much faster than openpyxl
+        return pd.read_excel(path, engine="calamine", usecols=_is_worker_column, dtype=str)
+    except (ImportError, ValueError):
+        return pd.read_excel(path, engine="openpyxl", usecols=_is_worker_column, dtype=str)
+
+@lru_cache(maxsize=64)
+def _avail_column(columns):
+    """First column whose name mentions 'available' (a workplace keeps one header)"""
+    return next((c for c in columns if _AVAIL_RE.search(c)), None)
+
+def _text_column(df, name):
+    """Column as stripped strings (blank for missing cells or a missing column)"""
+    import pandas as pd
+    if name not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[name].fillna("").astype(str).str.strip()
+
+def _freeze_availability(text):
+    """parse_availability as nested tuples, so the strings in it can be shared"""
+    return tuple(
+        (day, tuple((b["start"], b["end"], b["start_hour"], b["end_hour"]) for b in blocks))
+        for day, blocks in parse_availability(text).items()
+    )
+
+_frozen_availability = lru_cache(maxsize=4096)(_freeze_availability)
+
+def _thaw_availability(frozen):
+    """Fresh availability dicts from _freeze_availability's tuples"""
+    return {
+        sys.intern(day): [{"start": s, "end": e, "start_hour": sh, "end_hour": eh} for s, e, sh, eh in blocks]
+        for day, blocks in frozen
+    }
+
+def _parse_availability(text):
+    """parse_availability memoized across rows and reloads; every call gets its own dicts"""
+    # Workers with the same text end up sharing day names and time strings
+    return _thaw_availability(_frozen_availability(text))
+
+def _parse_availabilities(texts):
+    """Parse a column of availability texts (a few ms in-process even for large rosters)"""
+    return [_parse_availability(t) for t in texts]
+
+class EmailButtonDelegate(QStyledItemDelegate):
+    """Paints the contact column as an Email button; a click emails that row's worker"""
+    
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        painter.save()
+        painter.fillRect(rect, EMAIL_BUTTON_BRUSH)
+        painter.setPen(Qt.white)
+        painter.drawText(rect, Qt.AlignCenter, "Email")
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            self.parent().compose_email(index.sibling(index.row(), 1).data())
+            return True
+        # Swallow presses and double-clicks so the cell never opens an editor
+        return event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick)
+
 class LastMinuteAvailabilityDialog(QDialog):
     def __init__(self, workplace, parent=None):
         super().__init__(parent)
         self.workplace = workplace
         self.workers = []
+        self._by_day = {}
+        self._avail_cache = {}
+        self._check_pending = False
         self.firebase_available = firebase_available()
         self.data_manager = get_data_manager() if self.firebase_available else None
         self.initUI()
@@ -92,11 +175,11 @@ class LastMinuteAvailabilityDialog(QDialog):
         # Check availability button
         button_layout = QHBoxLayout()
         chk = StyleHelper.create_action_button("Check Availability")
-        chk.clicked.connect(self.checkAvailability)
+        chk.clicked.connect(self._queue_check)
         button_layout.addWidget(chk)
         
         reload_btn = StyleHelper.create_button("Reload Workers")
-        reload_btn.clicked.connect(self.loadWorkers)
+        reload_btn.clicked.connect(lambda: self.loadWorkers(force=True))
         button_layout.addWidget(reload_btn)
         
         layout.addLayout(button_layout)
@@ -106,6 +189,7 @@ class LastMinuteAvailabilityDialog(QDialog):
         self.tbl.setColumnCount(4)
         self.tbl.setHorizontalHeaderLabels(["Name", "Email", "Work Study", "Contact"])
         self.tbl.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tbl.setItemDelegateForColumn(3, EmailButtonDelegate(self))
         layout.addWidget(self.tbl)
 
         # Status label
@@ -132,9 +216,10 @@ class LastMinuteAvailabilityDialog(QDialog):
             else:
                 self.use_firebase.setChecked(True)
 
-    def loadWorkers(self):
-        """Load workers from either Firebase or Excel file"""
+    def loadWorkers(self, force=False):
+        """Load workers from either Firebase or Excel file (force re-reads the Excel file)"""
         self.workers = []
+        index = None
         
         # Show progress dialog
         progress = QProgressDialog("Loading workers...", None, 0, 100, self)
@@ -149,48 +234,48 @@ class LastMinuteAvailabilityDialog(QDialog):
         )
         
         if use_firebase:
-            # Load from Firebase
+            # Load from Firebase, looking up the cached Excel fallback at the same
+            # time (the sheet itself is only parsed if Firebase comes back empty)
             progress.setValue(30)
             progress.setLabelText("Loading workers from Firebase...")
             
+            executor = ThreadPoolExecutor(max_workers=2)
             try:
-                # Make sure data manager is using the correct workplace
-                self.data_manager.load_workplace(self.workplace)
+                firebase_future = executor.submit(self._fetch_firebase_workers)
+                excel_future = None if force else executor.submit(self._fetch_excel_workers, cached_only=True)
                 
-                # Get workers
-                firebase_workers = self.data_manager.get_workers()
+                try:
+                    firebase_workers = firebase_future.result()
+                except Exception as e:
+                    logger.error(f"Error loading workers from Firebase: {e}")
+                    firebase_workers = None
+                    progress.setLabelText("Error with Firebase. Trying local Excel file...")
                 
                 progress.setValue(60)
                 
                 if firebase_workers:
-                    for worker in firebase_workers:
-                        self.workers.append({
-                            "first_name": worker.get("first_name", "").strip(),
-                            "last_name": worker.get("last_name", "").strip(),
-                            "email": worker.get("email", "").strip(),
-                            "work_study": worker.get("work_study", False),
-                            "availability": worker.get("availability", {})
-                        })
+                    self.workers = firebase_workers
                     
                     progress.setValue(90)
                     self.status_label.setText(f"Loaded {len(self.workers)} workers from Firebase.")
                     logger.info(f"Loaded {len(self.workers)} workers from Firebase for {self.workplace}")
                 else:
-                    # Try local Excel as fallback
+                    # Use the local Excel file as fallback
                     progress.setValue(70)
-                    progress.setLabelText("No workers found in Firebase. Trying local Excel file...")
-                    self._load_from_excel(progress)
-            except Exception as e:
-                logger.error(f"Error loading workers from Firebase: {e}")
-                progress.setValue(70)
-                progress.setLabelText("Error with Firebase. Trying local Excel file...")
-                self._load_from_excel(progress)
+                    if firebase_workers is not None:
+                        progress.setLabelText("No workers found in Firebase. Trying local Excel file...")
+                    index = self._load_from_excel(progress, force, excel_future)
+            finally:
+                # A cache lookup still running has nothing left to do
+                executor.shutdown(wait=False)
         else:
             # Load from Excel
             progress.setValue(30)
             progress.setLabelText("Loading workers from Excel file...")
-            self._load_from_excel(progress)
+            index = self._load_from_excel(progress, force)
         
+        self._index_availability(index)
+        self._populate_all_rows()
         progress.setValue(100)
         
         # Update status label
@@ -199,55 +284,148 @@ class LastMinuteAvailabilityDialog(QDialog):
         else:
             self.status_label.setText("No workers loaded. Please check data source.")
 
-    def _load_from_excel(self, progress=None):
-        """Load workers from Excel file"""
-        path = os.path.join(DIRS['workplaces'], f"{self.workplace}.xlsx")
-        if not os.path.exists(path):
-            if progress:
-                progress.setValue(100)
-            QMessageBox.warning(self, "Warning", "No Excel file found.")
-            self.status_label.setText("Error: No Excel file found.")
-            return
+    def _index_availability(self, index=None):
+        """Install the availability index for self.workers, building it unless one was loaded"""
+        self._by_day = index if index is not None else build_availability_index(self.workers)
+        self._avail_cache = {}
+
+    def _populate_all_rows(self):
+        """
+        Give every loaded worker a (hidden) results row, row i for self.workers[i]
         
+        Checks then only show or hide rows instead of rebuilding the table.
+        """
+        self.tbl.setUpdatesEnabled(False)
+        self.tbl.blockSignals(True)
         try:
-            if progress:
-                progress.setLabelText("Reading Excel file...")
+            self.tbl.clearContents()
+            self.tbl.setRowCount(len(self.workers))
+            for i, w in enumerate(self.workers):
+                # Name column
+                self.tbl.setItem(i, 0, QTableWidgetItem(f"{w['first_name']} {w['last_name']}"))
                 
-            df = pd.read_excel(path)
-            df.columns = df.columns.str.strip()
-            df = df.dropna(subset=['Email'], how='all')
-            df = df[df['Email'].str.strip()!='']
-            
-            if progress:
-                progress.setValue(80)
-                progress.setLabelText("Processing worker data...")
-            
-            col = next((c for c in df.columns if 'available' in c.lower()), None)
-            for _, r in df.iterrows():
-                txt = str(r.get(col,"")) if col else ""
-                if pd.isna(txt) or txt.lower()=="nan":
-                    txt = ""
-                avail = parse_availability(txt)
-                self.workers.append({
-                    "first_name": r.get("First Name","").strip(),
-                    "last_name":  r.get("Last Name","").strip(),
-                    "email":      r.get("Email","").strip(),
-                    "work_study": str(r.get("Work Study","")).strip().lower() in ['yes','y','true'],
-                    "availability": avail
-                })
-            
-            self.status_label.setText(f"Loaded {len(self.workers)} workers from Excel file.")
-            logger.info(f"Loaded {len(self.workers)} workers from Excel for {self.workplace}")
-            
-            if progress:
-                progress.setValue(100)
+                # Email column
+                self.tbl.setItem(i, 1, QTableWidgetItem(w['email']))
+                
+                # Work Study column
+                work_study_item = QTableWidgetItem("Yes" if w['work_study'] else "No")
+                if w['work_study']:
+                    work_study_item.setBackground(WORK_STUDY_BRUSH)
+                self.tbl.setItem(i, 2, work_study_item)
+                
+                # The contact column is drawn by EmailButtonDelegate
                 
+                self.tbl.setRowHidden(i, True)
+        finally:
+            self.tbl.blockSignals(False)
+            self.tbl.setUpdatesEnabled(True)
+
+    def _fetch_firebase_workers(self):
+        """Workers for this workplace from Firebase (safe to run off the UI thread)"""
+        # Make sure data manager is using the correct workplace
+        self.data_manager.load_workplace(self.workplace)
+        
+        return [
+            {
+                "first_name": worker.get("first_name", "").strip(),
+                "last_name": worker.get("last_name", "").strip(),
+                "email": worker.get("email", "").strip(),
+                "work_study": worker.get("work_study", False),
+                "availability": {
+                    sys.intern(day): blocks for day, blocks in worker.get("availability", {}).items()
+                }
+            }
+            for worker in self.data_manager.get_workers()
+        ]
+
+    def _fetch_excel_workers(self, force=False, cached_only=False):
+        """
+        Workers parsed from the workplace Excel file and their availability
+        index, reusing the parsed copy while the file is unchanged (safe to
+        run off the UI thread)
+        
+        Returns (workers, index), or None if the workplace has no Excel file.
+        With cached_only, returns False instead of parsing on a cache miss.
+        """
+        import pandas as pd
+        path = os.path.join(DIRS['workplaces'], f"{self.workplace}.xlsx")
+        if not os.path.exists(path):
+            return None
+        
+        mtime, cached, index = load_cached(path)
+        if cached is not None and not force:
+            logger.info(f"Loaded {len(cached)} cached workers from Excel for {self.workplace}")
+            return cached, index
+        if cached_only:
+            return False
+        
+        df = _read_worker_sheet(path)
+        df.columns = df.columns.str.strip()
+        df = df.dropna(subset=['Email'], how='all')
+        df = df[df['Email'].str.strip()!='']
+        
+        # Pull whole columns instead of building a Series per row
+        col = _avail_column(tuple(df.columns))
+        first = _text_column(df, "First Name").tolist()
+        last = _text_column(df, "Last Name").tolist()
+        email = _text_column(df, "Email").tolist()
+        ws = _text_column(df, "Work Study").str.lower().isin(['yes','y','true']).tolist()
+        texts = df[col].astype(str) if col else pd.Series("", index=df.index)
+        texts = texts.where(texts.str.lower() != "nan", "").tolist()
+        avails = _parse_availabilities(texts)
+        workers = [
+            {"first_name": f, "last_name": l, "email": e, "work_study": w, "availability": a}
+            for f, l, e, w, a in zip(first, last, email, ws, avails)
+        ]
+        
+        index = build_availability_index(workers)
+        save_cached(path, mtime, workers, index)
+        logger.info(f"Loaded {len(workers)} workers from Excel for {self.workplace}")
+        return workers, index
+
+    def _load_from_excel(self, progress=None, force=False, future=None):
+        """
+        Load workers from Excel file, or from a cache lookup already in flight
+        
+        Returns their availability index, or None if nothing was loaded.
+        """
+        try:
+            result = future.result() if future is not None else False
+            if result is False:
+                # Nothing cached (or no lookup was started); parse the sheet now
+                if progress:
+                    progress.setLabelText("Reading Excel file...")
+                result = self._fetch_excel_workers(force)
         except Exception as e:
             if progress:
                 progress.setValue(100)
             logger.error(f"Load workers from Excel: {e}")
             QMessageBox.critical(self, "Error", str(e))
             self.status_label.setText(f"Error loading workers: {str(e)}")
+            return None
+        
+        if progress:
+            progress.setValue(100)
+        
+        if result is None:
+            QMessageBox.warning(self, "Warning", "No Excel file found.")
+            self.status_label.setText("Error: No Excel file found.")
+            return None
+        
+        workers, index = result
+        self.workers.extend(workers)
+        self.status_label.setText(f"Loaded {len(self.workers)} workers from Excel file.")
+        return index
+
+    def _queue_check(self):
+        """Collapse a burst of clicks into a single availability check"""
+        if not self._check_pending:
+            self._check_pending = True
+            QTimer.singleShot(0, self._run_queued_check)
+
+    def _run_queued_check(self):
+        self._check_pending = False
+        self.checkAvailability()
 
     def checkAvailability(self):
         try:
@@ -267,47 +445,21 @@ class LastMinuteAvailabilityDialog(QDialog):
                 QMessageBox.warning(self, "Invalid Time Range", "End time must be after start time.")
                 return
             
-            # Find available workers
-            avail = []
-            for w in self.workers:
-                day_blocks = w['availability'].get(day, [])
-                if not day_blocks:
-                    continue
-                    
-                for b in day_blocks:
-                    if b.get('start_hour', 0) <= start_hour and end_hour <= b.get('end_hour', 24):
-                        avail.append(w)
-                        break
+            # Find available workers, reusing the answer for a repeated query
+            key = (day, start_hour, end_hour)
+            avail = self._avail_cache.get(key)
+            if avail is None:
+                avail = available_worker_indexes(self._by_day, day, start_hour, end_hour)
+                self._avail_cache[key] = avail
             
-            # Update results table
-            self.tbl.setRowCount(len(avail))
-            for i, w in enumerate(avail):
-                # Name column
-                name = f"{w['first_name']} {w['last_name']}"
-                self.tbl.setItem(i, 0, QTableWidgetItem(name))
-                
-                # Email column
-                email_item = QTableWidgetItem(w['email'])
-                self.tbl.setItem(i, 1, email_item)
-                
-                # Work Study column
-                work_study_text = "Yes" if w['work_study'] else "No"
-                work_study_item = QTableWidgetItem(work_study_text)
-                if w['work_study']:
-                    work_study_item.setBackground(Qt.yellow)
-                self.tbl.setItem(i, 2, work_study_item)
-                
-                # Add contact button
-                contact_cell = QWidget()
-                contact_layout = QHBoxLayout(contact_cell)
-                contact_layout.setContentsMargins(2, 2, 2, 2)
-                
-                email_btn = QPushButton("Email")
-                email_btn.setStyleSheet("background-color: #007bff; color: white;")
-                email_btn.clicked.connect(lambda _, email=w['email']: self.compose_email(email))
-                
-                contact_layout.addWidget(email_btn)
-                self.tbl.setCellWidget(i, 3, contact_cell)
+            # Show just the matching rows, repainting once
+            shown = set(avail)
+            self.tbl.setUpdatesEnabled(False)
+            try:
+                for row in range(self.tbl.rowCount()):
+                    self.tbl.setRowHidden(row, row not in shown)
+            finally:
+                self.tbl.setUpdatesEnabled(True)
             
             # Update status
             if avail:
@@ -339,8 +491,6 @@ class LastMinuteAvailabilityDialog(QDialog):
             mailto_url = f"mailto:{email}?subject={urllib.parse.quote(subject)}&body={urllib.parse.quote(body)}"
             
             # Open default email client
-            from PyQt5.QtGui import QDesktopServices
-            from PyQt5.QtCore import QUrl
             QDesktopServices.openUrl(QUrl(mailto_url))
             
         except Exception as e:
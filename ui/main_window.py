@@ -2,23 +2,110 @@
 
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, 
                             QLabel, QPushButton, QMessageBox, QInputDialog, QLineEdit, QDialog, 
-                            QFormLayout, QProgressDialog, QFileDialog)
+                            QFormLayout, QProgressDialog, QFileDialog, QTextEdit)
 from PyQt5.QtGui import QFont, QDesktopServices
-from PyQt5.QtCore import Qt, pyqtSlot, QUrl
+from PyQt5.QtCore import (Qt, pyqtSlot, pyqtSignal, QObject, QRunnable, QSettings,
+                          QThread, QThreadPool, QTimer, QUrl)
 from .workplace_tab import WorkplaceTab
 from .style_helper import StyleHelper
-from core.config import initialize_firebase, db, firebase_available
+from core.config import CRED_FILE, initialize_firebase, db, firebase_available
 from core.data import get_data_manager, export_all_workers_to_firebase, load_data, save_workers_from_ui
+from core.firebase_manager import FirebaseManager
 import logging
 import json
 import os
 import sys
+import time
 
 APP_NAME = "Workplace Scheduler"
 APP_VERSION = "1.1.0"  # Updated version for Firebase integration
 
 logger = logging.getLogger(__name__)
 
+# QSettings key for the credentials file of the last successful connection
+CRED_PATH_SETTING = "firebase/cred_path"
+
+def _settings():
+    return QSettings("Finn", "WorkplaceScheduler")
+
+def saved_cred_path():
+    """Credentials file that last connected successfully, if it still exists"""
+    path = _settings().value(CRED_PATH_SETTING, "", type=str)
+    return path if path and os.path.exists(path) else None
+
+def remember_cred_path(path):
+    """Record a credentials file that connected successfully"""
+    _settings().setValue(CRED_PATH_SETTING, path)
+
+# How much of the end of the log the log dialog reads up front
+LOG_TAIL_BYTES = 256 * 1024
+
+def _read_log(log_path, tail_bytes=None):
+    """Log text, or only its last tail_bytes (prefixed with a note) if it is longer"""
+    size = os.path.getsize(log_path)
+    with open(log_path, "rb") as f:
+        truncated = tail_bytes is not None and size > tail_bytes
+        if truncated:
+            f.seek(size - tail_bytes)
+        text = f.read().decode("utf-8", "ignore")
+    if truncated:
+        # Drop the partial first line
+        text = "... (truncated)\n" + text.split("\n", 1)[-1]
+    return text, truncated
+
+# Seconds a workplace's Firebase data is shown from memory when its tab is reopened
+TAB_CACHE_TTL = 300
+
+class MigrationWorker(QThread):
+    """Runs the full Firebase migration off the UI thread"""
+    progress = pyqtSignal(int)
+    finished_ok = pyqtSignal(bool)
+    
+    def run(self):
+        try:
+            from scripts.firebase_migration import run_migration
+            result = run_migration(progress_cb=self.progress.emit)
+        except Exception as e:
+            logger.error(f"Migration error: {e}")
+            result = False
+        self.finished_ok.emit(result)
+
+class TabRefreshWorker(QThread):
+    """Fetches a workplace's workers and hours from Firebase off the UI thread"""
+    loaded = pyqtSignal(str, int, object)  # workplace, generation, {'workers': [...], 'hours': {...}}
+    
+    def __init__(self, workplace, generation=0, parent=None):
+        super().__init__(parent)
+        self.workplace = workplace
+        self.generation = generation
+    
+    def run(self):
+        try:
+            firebase = FirebaseManager.get_instance()
+            payload = {
+                'workers': firebase.get_workers(self.workplace),
+                'hours': firebase.get_hours_of_operation(self.workplace),
+            }
+        except Exception as e:
+            logger.error(f"Error refreshing {self.workplace} from Firebase: {e}")
+            return
+        self.loaded.emit(self.workplace, self.generation, payload)
+
+class FirebaseInitSignals(QObject):
+    """Signals FirebaseInitTask emits back on the UI thread"""
+    done = pyqtSignal(bool)
+
+class FirebaseInitTask(QRunnable):
+    """Initialize Firebase off the UI thread"""
+    
+    def __init__(self, cred_file):
+        super().__init__()
+        self.cred_file = cred_file
+        self.signals = FirebaseInitSignals()
+    
+    def run(self):
+        self.signals.done.emit(initialize_firebase(self.cred_file))
+
 class FirebaseSetupDialog(QDialog):
     """Dialog for Firebase project setup"""
     def __init__(self, parent=None):
@@ -84,6 +171,18 @@ class MainWindow(QMainWindow):
         # Initialize data manager
         self.data_manager = get_data_manager()
         
+        # workplace -> (time.monotonic() when fetched, Firebase payload) for tab switches
+        self._wp_cache = {}
+        self._tab_refreshes = {}
+        # Bumped on every write to a workplace; older refreshes are ignored
+        self._tab_generations = {}
+        
+        # Coalesces a burst of tab changes into one reload of the last tab
+        self._pending_tab_index = -1
+        self._tab_reload_timer = QTimer(self)
+        self._tab_reload_timer.setSingleShot(True)
+        self._tab_reload_timer.timeout.connect(self._do_tab_reload)
+        
         # Check Firebase connection
         self.firebase_status = firebase_available()
         
@@ -146,6 +245,10 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(WorkplaceTab("it_service_center"),  "IT Service Center")
         layout.addWidget(self.tabs)
         
+        # Forget cached Firebase data for a workplace once its tab writes
+        for i in range(self.tabs.count()):
+            self.tabs.widget(i).data_changed.connect(self._drop_tab_cache)
+        
         # Connect tab change signal
         self.tabs.currentChanged.connect(self.on_tab_changed)
         
@@ -170,20 +273,68 @@ class MainWindow(QMainWindow):
             self.migrate_btn.setEnabled(False)
     
     def on_tab_changed(self, index):
-        """Handle tab change event"""
+        """Handle tab change event (the reload waits until the tabs settle)"""
+        self._pending_tab_index = index
+        self._tab_reload_timer.start(150)
+    
+    def _do_tab_reload(self):
+        """Reload the tab that was selected last"""
+        index = self._pending_tab_index
         if index >= 0 and self.firebase_status:
             current_tab = self.tabs.widget(index)
             if current_tab and isinstance(current_tab, WorkplaceTab):
-                # Refresh the tab with Firebase data
-                current_tab.load_workers_table()
-                current_tab.load_hours_table()
+                # Show recently fetched data right away
+                cached = self._wp_cache.get(current_tab.workplace)
+                if cached and time.monotonic() - cached[0] < TAB_CACHE_TTL:
+                    current_tab.load_from_cache(cached[1])
+                
+                # Refresh the tab with Firebase data in the background
+                self._refresh_tab_data(current_tab.workplace)
+    
+    def _refresh_tab_data(self, workplace):
+        """Start a background Firebase fetch for a workplace unless one is running"""
+        if workplace in self._tab_refreshes:
+            return
+        worker = TabRefreshWorker(workplace, self._tab_generations.get(workplace, 0), self)
+        worker.loaded.connect(self._on_tab_data_loaded)
+        worker.finished.connect(lambda: self._on_tab_refresh_finished(worker))
+        worker.finished.connect(worker.deleteLater)
+        self._tab_refreshes[workplace] = worker
+        worker.start()
+    
+    def _drop_tab_cache(self, workplace):
+        """Discard cached Firebase data for a workplace that was just written"""
+        self._wp_cache.pop(workplace, None)
+        # A fetch already in flight may have read the data from before the write;
+        # its result is ignored, and the next tab switch may start a new one
+        self._tab_generations[workplace] = self._tab_generations.get(workplace, 0) + 1
+        self._tab_refreshes.pop(workplace, None)
+    
+    def _on_tab_refresh_finished(self, worker):
+        """Forget a finished refresh unless a newer one has replaced it"""
+        if self._tab_refreshes.get(worker.workplace) is worker:
+            del self._tab_refreshes[worker.workplace]
+    
+    def _on_tab_data_loaded(self, workplace, generation, payload):
+        """Cache fresh Firebase data and redraw the workplace's tab if it changed"""
+        if generation != self._tab_generations.get(workplace, 0):
+            return
+        
+        cached = self._wp_cache.get(workplace)
+        self._wp_cache[workplace] = (time.monotonic(), payload)
+        if cached and cached[1] == payload:
+            return
+        
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if isinstance(tab, WorkplaceTab) and tab.workplace == workplace:
+                tab.load_from_cache(payload)
     
     @pyqtSlot()
     def connect_to_firebase(self):
         """Attempt to connect or reconnect to Firebase"""
-        # Check if credentials file exists
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        cred_file = os.path.join(base_dir, 'workplace-scheduler-ace38-firebase-adminsdk-fbsvc-4d7d358b05.json')
+        # Reuse the credentials that worked last time, else check the default location
+        cred_file = saved_cred_path() or CRED_FILE
         
         if not os.path.exists(cred_file):
             # Prompt for Firebase credentials if not found
@@ -191,34 +342,34 @@ class MainWindow(QMainWindow):
             if dlg.exec_() == QDialog.Accepted:
                 selected_file = dlg.file_path.text()
                 if selected_file and os.path.exists(selected_file):
-                    # Copy the selected file to the default location
-                    try:
-                        import shutil
-                        shutil.copy2(selected_file, cred_file)
-                        QMessageBox.information(self, "Firebase Setup", 
-                            "Credentials file copied successfully. Attempting to connect to Firebase.")
-                    except Exception as e:
-                        QMessageBox.critical(self, "Error", 
-                            f"Failed to copy credentials file: {str(e)}")
-                        return
+                    # Connect with the selected file where it is; it is remembered
+                    # for next time once the connection succeeds
+                    cred_file = selected_file
                 else:
                     QMessageBox.warning(self, "Warning", "No valid credentials file selected.")
                     return
         
-        # Show progress dialog
-        progress = QProgressDialog("Connecting to Firebase...", None, 0, 100, self)
+        # Show a busy indicator; the window keeps repainting while Firebase connects
+        progress = QProgressDialog("Connecting to Firebase...", None, 0, 0, self)
         progress.setWindowTitle("Firebase Connection")
         progress.setWindowModality(Qt.WindowModal)
-        progress.setValue(10)
         progress.show()
         
-        # Initialize Firebase
-        success = initialize_firebase()
+        # Initialize Firebase on a pool thread
+        self._connect_progress = progress
+        self._connect_task = FirebaseInitTask(cred_file)
+        self._connect_task.signals.done.connect(
+            lambda success: self._on_firebase_connected(cred_file, success)
+        )
+        QThreadPool.globalInstance().start(self._connect_task)
+    
+    def _on_firebase_connected(self, cred_file, success):
+        """Report the result of a FirebaseInitTask"""
         self.firebase_status = success
-        
-        progress.setValue(100)
+        self._connect_progress.close()
         
         if success:
+            remember_cred_path(cred_file)
             QMessageBox.information(self, "Firebase Connection", 
                                    "Successfully connected to Firebase!")
             
@@ -264,32 +415,12 @@ class MainWindow(QMainWindow):
         progress.show()
         
         try:
-            # Import and run migration script
-            from scripts.firebase_migration import run_migration
-            
-            # Run in a separate thread to avoid freezing UI
-            import threading
-            
-            def run_migration_thread():
-                result = run_migration()
-                # Update UI from main thread
-                from PyQt5.QtCore import QMetaObject, Qt, Q_ARG
-                QMetaObject.invokeMethod(
-                    self, "migration_completed", 
-                    Qt.QueuedConnection, 
-                    Q_ARG(bool, result)
-                )
-            
-            # Start migration thread
-            threading.Thread(target=run_migration_thread).start()
-            
-            # Update progress (not actual progress, just visual feedback)
-            import time
-            for i in range(11, 100, 10):
-                time.sleep(1)  # Simulate work being done
-                progress.setValue(i)
-                
-            # Final progress will be set when migration completes
+            # Run in a worker thread; its signals arrive queued on the UI thread
+            self._migration_progress = progress
+            self._migration_worker = MigrationWorker(self)
+            self._migration_worker.progress.connect(progress.setValue)
+            self._migration_worker.finished_ok.connect(self._on_migration_finished)
+            self._migration_worker.start()
             
         except Exception as e:
             progress.setValue(100)
@@ -297,6 +428,11 @@ class MainWindow(QMainWindow):
                               f"Error running migration: {str(e)}")
             logger.error(f"Migration error: {e}")
     
+    def _on_migration_finished(self, success):
+        """Close out the migration progress dialog, then report the result"""
+        self._migration_progress.setValue(100)
+        self.migration_completed(success)
+    
     @pyqtSlot(bool)
     def migration_completed(self, success):
         """Called when migration is complete"""
@@ -305,6 +441,7 @@ class MainWindow(QMainWindow):
                                  "Data migration to Firebase completed successfully.")
             
             # Refresh all tabs
+            self._wp_cache.clear()
             for i in range(self.tabs.count()):
                 tab = self.tabs.widget(i)
                 if isinstance(tab, WorkplaceTab):
@@ -346,6 +483,7 @@ class MainWindow(QMainWindow):
                 # Refresh UI
                 progress.setValue(90)
                 if result:
+                    self._drop_tab_cache(current_workplace)
                     current_tab.load_workers_table()
                     current_tab.load_hours_table()
                     
@@ -399,9 +537,12 @@ class MainWindow(QMainWindow):
                     progress.show()
                     
                     try:
-                        # Use the save_workers_from_ui function
-                        progress.setValue(50)
-                        result = save_workers_from_ui(current_workplace, workers)
+                        # Use the save_workers_from_ui function; the writes fill 20-100%
+                        progress.setValue(20)
+                        result = save_workers_from_ui(
+                            current_workplace, workers,
+                            progress_cb=lambda pct: progress.setValue(20 + pct * 80 // 100)
+                        )
                         
                         progress.setValue(100)
                         
@@ -410,6 +551,7 @@ class MainWindow(QMainWindow):
                                                 f"Successfully exported {len(workers)} workers from UI to Firebase for {display_name}.")
                             
                             # Refresh the tab to show updated data
+                            self._drop_tab_cache(current_workplace)
                             self.data_manager.load_workplace(current_workplace)
                             current_tab.load_workers_table()
                         else:
@@ -425,8 +567,6 @@ class MainWindow(QMainWindow):
                                 "No workers found in the current table.")
 
     def show_log_dialog(self):
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel
-        import os
         log_path = os.path.join("logs", "firebase_test.log")
         dlg = QDialog(self)
         dlg.setWindowTitle("Application Log")
@@ -438,13 +578,23 @@ class MainWindow(QMainWindow):
         log_view = QTextEdit()
         log_view.setReadOnly(True)
         log_view.setStyleSheet("background-color: #212529; color: #e9ecef; font-family: monospace; font-size: 12px; border-radius: 6px; padding: 8px;")
+        truncated = False
         if os.path.exists(log_path):
-            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                log_view.setPlainText(f.read())
+            text, truncated = _read_log(log_path, LOG_TAIL_BYTES)
+            log_view.setPlainText(text)
         else:
             log_view.setPlainText("Log file not found: " + log_path)
         L.addWidget(log_view)
         btns = QHBoxLayout()
+        if truncated:
+            full_btn = QPushButton("Load Full Log")
+            
+            def load_full_log():
+                log_view.setPlainText(_read_log(log_path)[0])
+                full_btn.setEnabled(False)
+            
+            full_btn.clicked.connect(load_full_log)
+            btns.addWidget(full_btn)
         btns.addStretch()
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(dlg.accept)
@@ -7,9 +7,13 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from core.parser import time_to_hour, format_time_ampm
-from core.scheduler import is_worker_available, hour_to_time_str
-from core.config import DAYS, firebase_available
+from core.scheduler import (
+    is_worker_available, hour_to_time_str,
+    build_availability_index, available_worker_indexes
+)
+from core.config import DAYS, DAY_INDEX, firebase_available
 from core.data import get_data_manager
+import heapq
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +35,10 @@ class ShiftOverrideDialog(QDialog):
         self.firebase_available   = firebase_available()
         self.parent_dialog        = parent
         
+        # Built once for the availability list shown on every row click
+        self._names = [f"{w['first_name']} {w['last_name']}" for w in all_workers]
+        self._avail_index = build_availability_index(all_workers)
+        
         self.setWindowTitle("Manual Shift Override")
         self.resize(900, 600)
         self._build_ui()
@@ -112,36 +120,65 @@ class ShiftOverrideDialog(QDialog):
         """
         Clear and refill the schedule table, rebuilding the row→(day, index) map.
         """
-        self.sch_table.clearContents()
-        self.sch_table.setRowCount(0)
-        self._row_map = []
+        # Fill with painting and signals off so Qt repaints once, not per item
+        self.sch_table.setUpdatesEnabled(False)
+        self.sch_table.blockSignals(True)
+        try:
+            self.sch_table.clearContents()
+            self.sch_table.setRowCount(0)
+            self._row_map = []
 
-        rows = []
-        for day in DAYS:
-            for idx, shift in enumerate(self.schedule.get(day, [])):
-                rows.append((
-                    day,
-                    shift['start'],
-                    shift['end'],
-                    ", ".join(shift['assigned'])
-                ))
-                self._row_map.append((day, idx))
+            rows = []
+            for day in DAYS:
+                for idx, shift in enumerate(self.schedule.get(day, [])):
+                    rows.append((
+                        day,
+                        shift['start'],
+                        shift['end'],
+                        ", ".join(shift['assigned'])
+                    ))
+                    self._row_map.append((day, idx))
 
-        self.sch_table.setRowCount(len(rows))
-        for i, (day, s, e, assigned) in enumerate(rows):
-            self.sch_table.setItem(i, 0, QTableWidgetItem(day))
-            self.sch_table.setItem(i, 1,
-                QTableWidgetItem(format_time_ampm(s))
-            )
-            self.sch_table.setItem(i, 2,
-                QTableWidgetItem(format_time_ampm(e))
-            )
-            itm = QTableWidgetItem(assigned)
-            itm.setFlags(itm.flags() & ~Qt.ItemIsEditable)
-            self.sch_table.setItem(i, 3, itm)
+            self.sch_table.setRowCount(len(rows))
+            for i, (day, s, e, assigned) in enumerate(rows):
+                self.sch_table.setItem(i, 0, QTableWidgetItem(day))
+                self.sch_table.setItem(i, 1,
+                    QTableWidgetItem(format_time_ampm(s))
+                )
+                self.sch_table.setItem(i, 2,
+                    QTableWidgetItem(format_time_ampm(e))
+                )
+                itm = QTableWidgetItem(assigned)
+                itm.setFlags(itm.flags() & ~Qt.ItemIsEditable)
+                self.sch_table.setItem(i, 3, itm)
+        finally:
+            self.sch_table.blockSignals(False)
+            self.sch_table.setUpdatesEnabled(True)
+            self.sch_table.viewport().update()
 
         self.sch_table.resizeColumnsToContents()
 
+    def _insert_shift_row(self, day, idx):
+        """
+        Add a row for schedule[day][idx] after that day's existing rows,
+        leaving the rest of the table untouched.
+        """
+        shift = self.schedule[day][idx]
+        row = sum(1 for d, _ in self._row_map if DAY_INDEX[d] <= DAY_INDEX[day])
+        self._row_map.insert(row, (day, idx))
+
+        self.sch_table.insertRow(row)
+        self.sch_table.setItem(row, 0, QTableWidgetItem(day))
+        self.sch_table.setItem(row, 1,
+            QTableWidgetItem(format_time_ampm(shift['start']))
+        )
+        self.sch_table.setItem(row, 2,
+            QTableWidgetItem(format_time_ampm(shift['end']))
+        )
+        itm = QTableWidgetItem(", ".join(shift['assigned']))
+        itm.setFlags(itm.flags() & ~Qt.ItemIsEditable)
+        self.sch_table.setItem(row, 3, itm)
+
     def _on_row_selected(self):
         """
         Show which workers are available for the selected shift.
@@ -156,11 +193,11 @@ class ShiftOverrideDialog(QDialog):
         s_h = time_to_hour(shift['start'])
         e_h = time_to_hour(shift['end'])
 
-        for w in self.all_workers:
-            name  = f"{w['first_name']} {w['last_name']}"
-            avail = is_worker_available(w, day, s_h, e_h)
-            mark  = "✔️" if avail else "✖️"
-            self.avail_list.addItem(f"{name} — {mark}")
+        avail = set(available_worker_indexes(self._avail_index, day, s_h, e_h))
+        self.avail_list.addItems([
+            f"{name} — {'✔️' if i in avail else '✖️'}"
+            for i, name in enumerate(self._names)
+        ])
 
     def _on_add_shift(self):
         """
@@ -188,32 +225,33 @@ class ShiftOverrideDialog(QDialog):
                                     "No workers can cover that time slot.")
             return
 
-        # pick up to max_per_shift
-        chosen = elig[: self.max_per_shift]
+        # pick up to max_per_shift, least-loaded first (ties keep roster order)
+        chosen = heapq.nsmallest(
+            self.max_per_shift, elig,
+            key=lambda w: self.assigned_hours.get(w['email'], 0)
+        )
+        duration = e_h - s_h
         for w in chosen:
             em = w['email']
-            self.assigned_hours[em] = self.assigned_hours.get(em, 0) + (e_h - s_h)
-            self.schedule.setdefault(day, []).append({
-                "start":         hour_to_time_str(s_h),
-                "end":           hour_to_time_str(e_h),
-                "assigned":      [f"{w['first_name']} {w['last_name']}"],
-                "available":     [f"{x['first_name']} {x['last_name']}" for x in elig],
-                "raw_assigned":  [em],
-                "all_available": elig
-            })
+            self.assigned_hours[em] = self.assigned_hours.get(em, 0) + duration
+        
+        avail_names = [f"{x['first_name']} {x['last_name']}" for x in elig]
 
-        # fill any leftover slots as Unfilled
-        for _ in range(self.max_per_shift - len(chosen)):
-            self.schedule.setdefault(day, []).append({
-                "start":         hour_to_time_str(s_h),
-                "end":           hour_to_time_str(e_h),
-                "assigned":      ["Unfilled"],
-                "available":     [f"{x['first_name']} {x['last_name']}" for x in elig],
-                "raw_assigned":  [],
-                "all_available": elig
-            })
+        # one shift for the slot; leftover seats are marked Unfilled
+        day_shifts = self.schedule.setdefault(day, [])
+        day_shifts.append({
+            "start":         hour_to_time_str(s_h),
+            "end":           hour_to_time_str(e_h),
+            "start_hour":    s_h,
+            "end_hour":      e_h,
+            "assigned":      [f"{w['first_name']} {w['last_name']}" for w in chosen]
+                             + ["Unfilled"] * (self.max_per_shift - len(chosen)),
+            "available":     avail_names,
+            "raw_assigned":  [w['email'] for w in chosen],
+            "all_available": elig
+        })
 
-        self._populate_schedule()
+        self._insert_shift_row(day, len(day_shifts) - 1)
         QMessageBox.information(
             self, "Shift Added",
             f"Added shift on {day} {format_time_ampm(start)} – {format_time_ampm(end)}"
@@ -14,7 +14,7 @@ from PyQt5.QtWidgets import (
     QLineEdit, QTextEdit, QHeaderView, QListWidget, QListWidgetItem,
     QProgressDialog, QCheckBox, QFrame, QSizePolicy, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor, QFont
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 from PyQt5.QtGui import QTextDocument
@@ -38,6 +38,9 @@ from .shift_override_dialog import ShiftOverrideDialog
 
 class WorkplaceTab(QWidget):
     """Tab for managing a specific workplace."""
+    # Emitted with the workplace ID after this tab writes workers or hours
+    data_changed = pyqtSignal(str)
+
     def __init__(self, workplace, parent=None):
         super().__init__(parent)
         self.workplace = workplace
@@ -490,16 +493,22 @@ class WorkplaceTab(QWidget):
             try:
                 firebase_workers = fb_get_workers(self.workplace)
                 if firebase_workers:
-                    self._populate_workers_table_from_firebase(firebase_workers)
+                    if self._populate_workers_table_from_firebase(firebase_workers):
+                        self.tabs.setCurrentIndex(0)
                     return
             except Exception as e:
                 logging.error(f"Error loading workers from Firebase: {e}")
                 # Fall back to local file
         
         # If Firebase loading failed or is disabled, load from Excel file
+        if self._populate_workers_table_from_excel():
+            self.tabs.setCurrentIndex(0)
+
+    def _populate_workers_table_from_excel(self):
+        """Populate workers table from the workplace's Excel file; True if it was read"""
         path = os.path.join(DIRS['workplaces'], f"{self.workplace}.xlsx")
         if not os.path.exists(path):
-            return
+            return False
 
         try:
             df = pd.read_excel(path)
@@ -529,14 +538,15 @@ class WorkplaceTab(QWidget):
                 self.workers_table.setRowHeight(i, actions.minimumHeight())
 
             self.workers_table.resizeColumnsToContents()
-            self.tabs.setCurrentIndex(0)
+            return True
 
         except Exception as e:
             logging.error(f"Error loading workers from Excel: {e}")
             QMessageBox.critical(self, "Error", f"Error loading workers: {e}")
+            return False
 
     def _populate_workers_table_from_firebase(self, workers):
-        """Populate workers table with data from Firebase"""
+        """Populate workers table with data from Firebase; True if it succeeded"""
         try:
             self.workers_table.setRowCount(len(workers))
             for i, worker in enumerate(workers):
@@ -570,46 +580,31 @@ class WorkplaceTab(QWidget):
                 self.workers_table.setRowHeight(i, actions.minimumHeight())
 
             self.workers_table.resizeColumnsToContents()
-            self.tabs.setCurrentIndex(0)
+            return True
             
         except Exception as e:
             logging.error(f"Error populating workers table from Firebase: {e}")
             QMessageBox.critical(self, "Error", f"Error loading workers from Firebase: {e}")
+            return False
 
     def load_hours_table(self):
-        self.hours_table.setRowCount(0)
-        
         # Try to load from Firebase first if enabled
+        hours = {}
         if self.firebase_enabled:
             try:
                 hours = self.data_manager.get_hours_of_operation()
-                if hours:
-                    total = sum(len(v) for v in hours.values())
-                    self.hours_table.setRowCount(total or len(DAYS))  # At least one row per day
-                    
-                    r = 0
-                    for day in DAYS:
-                        blocks = hours.get(day, [])
-                        if not blocks:
-                            self.hours_table.setItem(r,0,QTableWidgetItem(day))
-                            self.hours_table.setItem(r,1,QTableWidgetItem("Closed"))
-                            self.hours_table.setItem(r,2,QTableWidgetItem("Closed"))
-                            r += 1
-                        else:
-                            for b in blocks:
-                                self.hours_table.setItem(r,0,QTableWidgetItem(day))
-                                self.hours_table.setItem(r,1,QTableWidgetItem(format_time_ampm(b['start'])))
-                                self.hours_table.setItem(r,2,QTableWidgetItem(format_time_ampm(b['end'])))
-                                r += 1
-                    
-                    self.hours_table.resizeColumnsToContents()
-                    return
             except Exception as e:
                 logging.error(f"Error loading hours from Firebase: {e}")
                 # Fall back to app_data
         
         # If Firebase loading failed or is disabled, load from app_data
-        hours = self.app_data.get(self.workplace, {}).get('hours_of_operation', {})
+        if not hours:
+            hours = self.app_data.get(self.workplace, {}).get('hours_of_operation', {})
+        self._fill_hours_table(hours)
+
+    def _fill_hours_table(self, hours):
+        """Show hours of operation, one row per block (Closed for days without one)"""
+        self.hours_table.setRowCount(0)
         total = sum(len(v) for v in hours.values())
         self.hours_table.setRowCount(total or len(DAYS))  # At least one row per day
         r = 0
@@ -628,6 +623,21 @@ class WorkplaceTab(QWidget):
                     r += 1
         self.hours_table.resizeColumnsToContents()
 
+    def load_from_cache(self, payload):
+        """
+        Fill the workers and hours tables from already-fetched Firebase data,
+        without another Firebase read and without switching the inner tab
+        """
+        self.workers_table.setRowCount(0)
+        if payload.get('workers'):
+            self._populate_workers_table_from_firebase(payload['workers'])
+        else:
+            # Nothing in Firebase; show the local Excel workers as load_workers_table would
+            self._populate_workers_table_from_excel()
+        
+        hours = payload.get('hours') or self.app_data.get(self.workplace, {}).get('hours_of_operation', {})
+        self._fill_hours_table(hours)
+
     def upload_excel(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Upload Excel File", "", "Excel Files (*.xlsx)"
@@ -638,6 +648,7 @@ class WorkplaceTab(QWidget):
             dst = os.path.join(DIRS['workplaces'], f"{self.workplace}.xlsx")
             shutil.copy2(file_path, dst)
             self.clean_excel_file(dst)
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             QMessageBox.information(self, "Success", "Excel file uploaded successfully.")
             
@@ -908,6 +919,7 @@ class WorkplaceTab(QWidget):
                 df.to_excel(path, index=False)
             
             # Reload workers table
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             dialog.accept()
             
@@ -1355,6 +1367,7 @@ class WorkplaceTab(QWidget):
                         logging.info(f"Worker {email} updated in Excel")
             
             # Reload workers table
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             dialog.accept()
             
@@ -1450,6 +1463,7 @@ class WorkplaceTab(QWidget):
                             logging.error(f"Failed to add worker {email} to Firebase")
             
             # Reload workers table
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             dialog.accept()
             
@@ -1533,6 +1547,7 @@ class WorkplaceTab(QWidget):
             progress.setValue(90)
             progress.setLabelText("Refreshing worker list...")
             
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             
             # Show result message
@@ -1615,6 +1630,7 @@ class WorkplaceTab(QWidget):
                 empty.to_excel(path, index=False)
             
             # Reload table to reflect changes
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             
             if not firebase_deleted:
@@ -1642,24 +1658,39 @@ class WorkplaceTab(QWidget):
         
         dialog = HoursOfOperationDialog(self.workplace, hours, self)
         if dialog.exec_() == QDialog.Accepted:
-            # Save to both Firebase and local app_data
-            success = True
-            if self.firebase_enabled:
+            self.data_changed.emit(self.workplace)
+            
+            # The dialog has already saved the hours and reported how it went;
+            # only retry the writes it was asked to make and couldn't
+            if dialog.firebase_requested and not dialog.saved_to_firebase:
                 try:
-                    success = self.data_manager.update_hours_of_operation(dialog.hours_data)
+                    retried = FirebaseManager.get_instance().update_hours_of_operation(
+                        self.workplace, dialog.hours_data
+                    )
                 except Exception as e:
                     logging.error(f"Error saving hours to Firebase: {e}")
-                    success = False
+                    retried = False
+                if retried:
+                    QMessageBox.information(self, "Success", "Hours saved to Firebase on retry.")
+                else:
+                    QMessageBox.warning(self, "Firebase Error",
+                                        "Hours could not be saved to Firebase; they are saved locally only.")
             
-            # Always save to local app_data as backup
+            if dialog.saved_locally:
+                # data.json already holds the new hours; just mirror them in app_data
+                self.app_data.setdefault(self.workplace, {})['hours_of_operation'] = dialog.hours_data
+                self.load_hours_table()
+                return
+            
+            # Only Firebase took the hours; retry the local backup
             data = load_data()
             data.setdefault(self.workplace, {})['hours_of_operation'] = dialog.hours_data
             if save_data(data):
                 self.app_data = data
-                self.load_hours_table()
-                QMessageBox.information(self, "Success", "Hours saved successfully.")
+                QMessageBox.information(self, "Success", "Hours saved locally on retry.")
             else:
-                QMessageBox.critical(self, "Error", "Error saving hours.")
+                QMessageBox.critical(self, "Error", "Error saving hours locally.")
+            self.load_hours_table()
 
     def generate_schedule(self):
         path = os.path.join(DIRS['workplaces'], f"{self.workplace}.xlsx")
@@ -2266,6 +2297,7 @@ class WorkplaceTab(QWidget):
         shift = schedule[day][idx]
         key = 'start' if col==1 else 'end'
         shift[key] = f"{dt.hour:02d}:{dt.minute:02d}"
+        shift[f"{key}_hour"] = hr
         item.setText(format_time_ampm(shift[key]))
         self.update_worker_hours_tab(dialog, dialog.hours_table)
 
@@ -2433,7 +2465,10 @@ class WorkplaceTab(QWidget):
             )
             return
 
-        shift['assigned']     = [f"{w['first_name']} {w['last_name']}" for w in selected] or ["Unfilled"]
+        # A shift record holds every seat of its slot; pad the seats left empty
+        seats = max(len(shift.get('assigned', [])), len(selected), 1)
+        shift['assigned']     = ([f"{w['first_name']} {w['last_name']}" for w in selected]
+                                 + ["Unfilled"] * (seats - len(selected)))
         shift['raw_assigned'] = [w['email'] for w in selected] or []
 
         itm = QTableWidgetItem(", ".join(shift['assigned']))
@@ -2826,6 +2861,7 @@ class WorkplaceTab(QWidget):
                 progress.setValue(50)
                 
                 # Update UI with Firebase data
+                self.data_changed.emit(self.workplace)
                 self.load_workers_table()
                 progress.setValue(75)
                 
@@ -2952,6 +2988,7 @@ class WorkplaceTab(QWidget):
                                  f"Successfully exported {success_count} workers to Firebase.")
             
             # Reload workers table
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             
         except Exception as e:
@@ -3013,6 +3050,7 @@ class WorkplaceTab(QWidget):
             progress.setValue(80)
             
             # Reload workers table
+            self.data_changed.emit(self.workplace)
             self.load_workers_table()
             
             progress.setValue(100)
@@ -3095,6 +3133,7 @@ class WorkplaceTab(QWidget):
             
             if save_data(data):
                 self.app_data = data
+                self.data_changed.emit(self.workplace)
                 self.load_hours_table()
                 
                 # Update last updated time